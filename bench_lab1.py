@@ -0,0 +1,95 @@
+import argparse
+import sys
+import time
+import tkinter as tk
+from types import SimpleNamespace
+
+import numpy as np
+
+from lab1 import ColorConverterApp
+
+# Замер задержки одного действия пользователя в ColorConverterApp.
+# Без дисплея запускать через Xvfb:  xvfb-run python bench_lab1.py
+# Окно скрыто (withdraw), события подаются напрямую в обработчики,
+# после каждого — flush_updates() и update_idletasks(), т.е. полный пересчёт и отрисовка.
+
+CREATE_METHODS = ("create_line", "create_rectangle", "create_image", "create_text", "create_oval", "create_polygon")
+
+
+def count_canvas_items(canvas, counter):
+    # Подменяем create_* у экземпляра холста, чтобы считать созданные элементы
+    for name in CREATE_METHODS:
+        original = getattr(canvas, name)
+
+        def wrapper(*args, _original=original, **kwargs):
+            counter[0] += 1
+            return _original(*args, **kwargs)
+
+        setattr(canvas, name, wrapper)
+
+
+def make_scenarios(app, rng):
+    def rgb_slider():
+        idx = int(rng.integers(3))
+        app.rgb_vars[idx].set(int(rng.integers(256)))
+        app.on_rgb_slider(idx)
+
+    def cmyk_entry():
+        idx = int(rng.integers(4))
+        app.cmyk_vars[idx].set(round(float(rng.random()), 2))
+        app.on_cmyk_entry(idx)
+
+    def hls_slider():
+        idx = int(rng.integers(3))
+        app.hls_vars[idx].set(float(rng.random()) * app.hls_max[idx])
+        app.on_hls_slider(idx)
+
+    def hue_click():
+        app.on_hue_click(SimpleNamespace(x=15, y=int(rng.integers(256))))
+
+    def sl_click():
+        app.on_sl_click(SimpleNamespace(x=int(rng.integers(256)), y=int(rng.integers(256))))
+
+    return {
+        "on_rgb_slider": rgb_slider,
+        "on_cmyk_entry": cmyk_entry,
+        "on_hls_slider": hls_slider,
+        "on_hue_click": hue_click,
+        "on_sl_click": sl_click,
+    }
+
+
+def run(events, seed):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Нет дисплея ({e}); запустите через xvfb-run")
+    root.withdraw()
+    app = ColorConverterApp(root)
+    created = [0]
+    count_canvas_items(app.hue_canvas, created)
+    count_canvas_items(app.sl_canvas, created)
+    rng = np.random.default_rng(seed)
+
+    print(f"{'событие':<16}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}{'элементов/соб.':>16}")
+    for name, scenario in make_scenarios(app, rng).items():
+        times = np.empty(events)
+        created[0] = 0
+        for i in range(events):
+            start = time.perf_counter()
+            scenario()
+            app.flush_updates()
+            root.update_idletasks()
+            times[i] = time.perf_counter() - start
+        p50, p95, p99 = np.percentile(times * 1000, [50, 95, 99])
+        print(f"{name:<16}{p50:>10.3f}{p95:>10.3f}{p99:>10.3f}{created[0] / events:>16.2f}")
+    print(f"Отброшено планировщиком: {app.dropped_events}, SL-квадратов в кэше: {len(app.sl_images)}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Задержка обработчиков ColorConverterApp")
+    parser.add_argument("--events", type=int, default=500, help="событий на каждый обработчик")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.events, args.seed)
@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from lab2 import (adaptive_median_filter, equalize_channel, equalize_hsv, equalize_rgb, hsv_to_rgb, image_digest,
+                  invalidate_stats, linear_contrast, median_filter_rgb, rgb_to_hsv)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# В репозитории — только хэши выходов: они не зависят от машины. Время и пик
+# памяти сравниваются с локальной базовой линией (в .gitignore), снятой здесь же
+BASELINE = os.path.join(HERE, "bench_lab2_baseline.json")
+LOCAL_BASELINE = os.path.join(HERE, "bench_lab2_local.json")
+HASH_FIELDS = ("hash", "shape")
+SIZES = {"256": (256, 256), "512": (512, 512), "1024": (1024, 1024), "2048": (2048, 2048),
+         "4K": (2160, 3840), "8K": (4320, 7680)}
+BUNDLED = ("median.png", "tuman.jpg", "h.jpg")
+SINGLE_RUN_PIXELS = 8 << 20  # с такого размера ядро запускается один раз
+MIN_TIME_DELTA = 0.002       # меньшие различия во времени — шум таймера, не регрессия
+
+
+def synthetic_image(h, w, seed=0):
+    # Гладкое цветное изображение: градиенты и синусоиды, без крайних значений
+    yy, xx = np.mgrid[0:h, 0:w]
+    rng = np.random.default_rng(seed)
+    img = np.stack([
+        128 + 80 * np.sin(xx / 37.0) * np.cos(yy / 23.0),
+        40 + 170 * xx / max(1, w - 1),
+        40 + 170 * yy / max(1, h - 1),
+    ], axis=-1)
+    img += rng.normal(0, 4, img.shape)
+    return np.clip(img, 10, 245).astype(np.uint8)
+
+
+def salt_and_pepper(img, density, seed=0):
+    rng = np.random.default_rng(seed)
+    noisy = img.copy()
+    mask = rng.random(img.shape[:2]) < density
+    values = np.where(rng.random(mask.sum()) < 0.5, 0, 255).astype(np.uint8)
+    noisy[mask] = values[:, None] if img.ndim == 3 else values
+    return noisy
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def timed_peak(func, *args, **kwargs):
+    # Время одного запуска и пик выделенной памяти (numpy сообщает о буферах в tracemalloc)
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+# ---------- Прежняя реализация HSV (только для сравнения) ----------
+def reference_rgb_to_hsv(img):
+    img = img.astype(np.float32) / 255.0
+    r, g, b = img[:, :, 0], img[:, :, 1], img[:, :, 2]
+    vmax = np.max(img, axis=2)
+    vmin = np.min(img, axis=2)
+    diff = vmax - vmin
+    h = np.zeros_like(vmax)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(vmax == 0, 0, diff / vmax)
+        mask = diff != 0
+        h[mask & (vmax == r)] = (60 * ((g - b) / diff) % 6)[mask & (vmax == r)]
+        h[mask & (vmax == g)] = (60 * ((b - r) / diff) + 2)[mask & (vmax == g)]
+        h[mask & (vmax == b)] = (60 * ((r - g) / diff) + 4)[mask & (vmax == b)]
+    h = np.clip(h, 0, 360)
+    return np.stack([h, s, vmax], axis=-1)
+
+
+def reference_hsv_to_rgb(hsv):
+    h, s, v = hsv[:, :, 0], hsv[:, :, 1], hsv[:, :, 2]
+    c = v * s
+    x = c * (1 - np.abs((h / 60) % 2 - 1))
+    m = v - c
+    rgb = np.zeros_like(hsv)
+    i = (h // 60).astype(int) % 6
+    z = np.zeros_like(c)
+    for sector, parts in enumerate([(c, x, z), (x, c, z), (z, c, x), (z, x, c), (x, z, c), (c, z, x)]):
+        rgb[i == sector] = np.stack(parts, axis=-1)[i == sector]
+    rgb = (rgb + m[:, :, np.newaxis]) * 255
+    return np.clip(rgb, 0, 255).astype(np.uint8)
+
+
+def reference_equalize_hsv(img):
+    hsv = reference_rgb_to_hsv(img)
+    hsv[:, :, 2] = equalize_channel((hsv[:, :, 2] * 255).astype(np.uint8)) / 255.0
+    return reference_hsv_to_rgb(hsv)
+
+
+def bench_hsv(size):
+    # Слитный float32-путь против прежнего: время и пик памяти в размерах изображения
+    img = synthetic_image(size, size)
+    print(f"HSV, {size}x{size}: время, с / пик памяти (в размерах изображения)")
+    cases = [
+        ("RGB->HSV->RGB", lambda: hsv_to_rgb(rgb_to_hsv(img)),
+         lambda: reference_hsv_to_rgb(reference_rgb_to_hsv(img))),
+        ("equalize_hsv", lambda: equalize_hsv(img), lambda: reference_equalize_hsv(img)),
+    ]
+    for name, new, old in cases:
+        t_new, m_new = timed_peak(new)
+        t_old, m_old = timed_peak(old)
+        print(f"  {name:<15} прежний {t_old:.3f} / {m_old / img.nbytes:.1f}x"
+              f"   новый {t_new:.3f} / {m_new / img.nbytes:.1f}x   ускорение {t_old / t_new:.1f}x")
+    assert np.array_equal(equalize_hsv(img), reference_equalize_hsv(img))
+
+
+def bench_adaptive(size, densities, max_k, repeat):
+    # Адаптивный фильтр против полного median_filter_rgb(k=5)
+    base = synthetic_image(size, size)
+    mp = size * size / 1e6
+    print(f"Адаптивный медианный фильтр (max_k={max_k}) против полного (k=5), {size}x{size}")
+    print(f"{'шум':>6}{'полный, с':>12}{'адаптивный, с':>16}{'ускорение':>12}")
+    full = timed(median_filter_rgb, base, 5, repeat=repeat)
+    for density in densities:
+        noisy = salt_and_pepper(base, density)
+        adaptive = timed(adaptive_median_filter, noisy, max_k, repeat=repeat)
+        print(f"{density:>6.0%}{full:>12.3f}{adaptive:>16.3f}{full / adaptive:>11.1f}x"
+              f"   ({mp / adaptive:.1f} Мп/с)")
+
+    path = os.path.join(HERE, "median.png")
+    if os.path.exists(path):
+        from PIL import Image
+        img = np.array(Image.open(path))
+        full = timed(median_filter_rgb, img, 5, repeat=repeat)
+        adaptive = timed(adaptive_median_filter, img, max_k, repeat=repeat)
+        print(f"median.png: полный {full:.3f} с, адаптивный {adaptive:.3f} с")
+
+
+# ---------- Набор ядер с базовой линией ----------
+# Каждое ядро на синтетике от 256x256 до 8K и на картинках из репозитория:
+# лучшее время из нескольких запусков, пик памяти (tracemalloc) и хэш выхода.
+# Хэши в базовой линии закрепляют текущие результаты — их расхождение
+# всегда ошибка; время и память сравниваются с допуском --threshold.
+# Время и память — своя базовая линия на каждой машине: снимается первым
+# запуском или --update-baseline, до этого не сравниваются.
+KERNELS = {
+    "median_filter_rgb": lambda img, hsv: median_filter_rgb(img, 5),
+    "equalize_rgb": lambda img, hsv: equalize_rgb(img),
+    "equalize_hsv": lambda img, hsv: equalize_hsv(img),
+    "rgb_to_hsv": lambda img, hsv: rgb_to_hsv(img),
+    "hsv_to_rgb": lambda img, hsv: hsv_to_rgb(hsv),
+    "linear_contrast": lambda img, hsv: linear_contrast(img),
+}
+
+
+def suite_inputs(sizes):
+    for name in sizes:
+        h, w = SIZES[name]
+        yield f"synthetic_{name}", synthetic_image(h, w)
+    from PIL import Image
+    for name in BUNDLED:
+        path = os.path.join(HERE, name)
+        if os.path.exists(path):
+            yield name, np.array(Image.open(path).convert("RGB"))
+
+
+def run_suite(sizes, kernels, repeat):
+    results = {}
+    print(f"{'случай':<44}{'время, мс':>12}{'пик, МБ':>10}  хэш")
+    for input_name, img in suite_inputs(sizes):
+        hsv = rgb_to_hsv(img)
+        runs = 1 if img.shape[0] * img.shape[1] >= SINGLE_RUN_PIXELS else repeat
+        for kernel in kernels:
+            # Статистика изображения кэшируется между вызовами — сбрасываем,
+            # чтобы время ядра не зависело от порядка запусков
+            def func(img, hsv, kernel=kernel):
+                invalidate_stats(img)
+                return KERNELS[kernel](img, hsv)
+
+            # Пик памяти — отдельным запуском: tracemalloc замедляет выделения
+            elapsed, peak = timed_peak(func, img, hsv)
+            if runs > 1:
+                elapsed = min(elapsed, timed(func, img, hsv, repeat=runs))
+            key = f"{kernel}/{input_name}"
+            results[key] = {
+                "time": elapsed,
+                "peak": peak,
+                "hash": image_digest(func(img, hsv)),
+                "shape": list(img.shape),
+            }
+            print(f"{key:<44}{elapsed * 1000:>12.2f}{peak / 2**20:>10.1f}  {results[key]['hash'][:12]}")
+    return results
+
+
+def compare_hashes(results, baseline):
+    # Список изменившихся выходов; случаи, которых нет в базовой линии, пропускаются
+    failures = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if base is not None and cur["hash"] != base["hash"]:
+            failures.append(f"{key}: выход изменился ({base['hash'][:12]} -> {cur['hash'][:12]})")
+    return failures
+
+
+def compare(results, baseline, threshold):
+    # Регрессии времени и памяти относительно локальной базовой линии
+    failures = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for field, unit, scale in (("time", "мс", 1000), ("peak", "МБ", 1 / 2**20)):
+            slack = MIN_TIME_DELTA if field == "time" else 0
+            if cur[field] > base[field] * (1 + threshold) + slack:
+                failures.append(f"{key}: {field} {base[field] * scale:.2f} -> {cur[field] * scale:.2f} {unit}"
+                                f" (+{cur[field] / base[field] - 1:.0%})")
+    return failures
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, baseline, results):
+    # Обновляем только посчитанные случаи, остальные остаются прежними
+    baseline = dict(baseline or {})
+    baseline.update(results)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+    print(f"Базовая линия записана: {path}")
+
+
+def suite(args):
+    results = run_suite(args.sizes, args.kernels, args.repeat)
+    hashes = {key: {field: cur[field] for field in HASH_FIELDS} for key, cur in results.items()}
+    baseline, local = load_baseline(args.baseline), load_baseline(args.local_baseline)
+    if args.update_baseline:
+        save_baseline(args.baseline, baseline, hashes)
+        save_baseline(args.local_baseline, local, results)
+        return 0
+    failures = []
+    if baseline is None:
+        save_baseline(args.baseline, baseline, hashes)
+    else:
+        failures += compare_hashes(hashes, baseline)
+    if local is None:
+        # Чужие тайминги ничего не говорят о регрессиях на этой машине
+        print("Локальной базовой линии нет — время и память не сравниваются")
+        save_baseline(args.local_baseline, local, results)
+    else:
+        failures += compare(results, local, args.threshold)
+    for line in failures:
+        print(f"РЕГРЕССИЯ {line}", file=sys.stderr)
+    print(f"Сравнено: {len(failures)} регрессий (допуск {args.threshold:.0%})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки фильтров lab2")
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.01, 0.05, 0.1, 0.2])
+    parser.add_argument("--max-k", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--suite", action="store_true", help="набор ядер со сравнением с базовой линией")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--kernels", nargs="+", choices=list(KERNELS), default=list(KERNELS))
+    parser.add_argument("--baseline", default=BASELINE, help="хэши выходов (в репозитории)")
+    parser.add_argument("--local-baseline", default=LOCAL_BASELINE, help="время и память на этой машине")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое ухудшение, доля")
+    args = parser.parse_args()
+    if args.suite:
+        sys.exit(suite(args))
+    bench_adaptive(args.size, args.densities, args.max_k, args.repeat)
+    bench_hsv(args.size)
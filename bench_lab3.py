@@ -0,0 +1,155 @@
+import argparse
+import csv
+import gc
+import math
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from lab3 import RasterLabApp, bresenham_circles, bresenham_lines, dda_lines
+
+# Честное сравнение алгоритмов растеризации: только сам алгоритм, без Tk.
+# Методы RasterLabApp вызываются с подставным self, у которого plot — приёмник:
+#   noop  — ничего не делает (чистая стоимость алгоритма и вызова plot);
+#   array — пишет координаты в заранее выделенные массивы.
+# Пакетные функции lab3 (dda_lines, bresenham_lines, bresenham_circles) идут с приёмником batch.
+# На каждую длину — несколько запусков на новых случайных примитивах;
+# результат — нс на пиксель, среднее и 95% доверительный интервал.
+
+LINE_ALGOS = {"step": "step_line", "dda": "dda_line", "bresenham_line": "bresenham_line_full"}
+CIRCLE_ALGOS = {"bresenham_circle": "bresenham_circle_full"}
+BATCH_ALGOS = {"dda_lines": dda_lines, "bresenham_lines": bresenham_lines, "bresenham_circles": bresenham_circles}
+MIN_RUN_PIXELS = 1 << 16  # пикселей в одном запуске, чтобы время было заметно больше разрешения таймера
+# Квантили t-распределения (95%, двусторонний) для 1..30 степеней свободы, дальше — 1.96
+T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+       2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+       2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+class ArraySink:
+    def __init__(self, capacity):
+        self.xs = np.empty(capacity, dtype=np.int64)
+        self.ys = np.empty(capacity, dtype=np.int64)
+        self.n = 0
+
+    def plot(self, x, y, color="red"):
+        self.xs[self.n] = x
+        self.ys[self.n] = y
+        self.n += 1
+
+
+def make_app(plot):
+    app = SimpleNamespace(plot=plot)
+    app.plot8circle = lambda cx, cy, x, y, color="blue": RasterLabApp.plot8circle(app, cx, cy, x, y, color)
+    return app
+
+
+def random_segments(rng, length, count):
+    # Длина в пикселях — max(|dx|, |dy|) + 1, направление случайное
+    major = rng.choice([-1, 1], count) * length
+    minor = rng.integers(-length, length + 1, count)
+    swap = rng.random(count) < 0.5
+    dx, dy = np.where(swap, minor, major), np.where(swap, major, minor)
+    x1 = rng.integers(-1000, 1001, count)
+    y1 = rng.integers(-1000, 1001, count)
+    return np.stack([x1, y1, x1 + dx, y1 + dy], axis=1)
+
+
+def random_circles(rng, length, count):
+    # Окружность даёт около 8 * r / sqrt(2) пикселей — подбираем r под ту же длину
+    r = max(1, int(length * math.sqrt(2) / 8))
+    r = rng.integers(max(1, r // 2), r + r // 2 + 1, count)
+    centers = rng.integers(-1000, 1001, (count, 2))
+    return np.column_stack([centers, r])
+
+
+def time_run(func, prims, sink, pixels):
+    # Один запуск: все примитивы подряд, сборщик мусора выключен
+    if sink == "batch":
+        gc.disable()
+        start = time.perf_counter()
+        func(prims)
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        return elapsed
+    rows = [tuple(int(v) for v in row) for row in prims]
+    if sink == "noop":
+        app = make_app(lambda x, y, color="red": None)
+    else:
+        app = make_app(ArraySink(pixels).plot)
+    gc.disable()
+    start = time.perf_counter()
+    for row in rows:
+        func(app, *row)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed
+
+
+def pixel_count(prims, circles):
+    # У всех трёх алгоритмов отрезка max(|dx|, |dy|) + 1 точек
+    if circles:
+        return int(bresenham_circles(prims)[2][-1])
+    return int((np.abs(prims[:, 2:] - prims[:, :2]).max(axis=1) + 1).sum())
+
+
+def summarize(values):
+    values = np.asarray(values)
+    mean = values.mean()
+    df = len(values) - 1
+    t = T95[df - 1] if df <= len(T95) else 1.96
+    half = t * values.std(ddof=1) / math.sqrt(len(values)) if df > 0 else float("nan")
+    return mean, mean - half, mean + half, float(np.median(values))
+
+
+def bench(lengths, runs, sinks, algos, seed):
+    rng = np.random.default_rng(seed)
+    rows = []
+    print(f"{'алгоритм':<20}{'приёмник':<9}{'длина':>9}{'нс/пикс':>11}{'95% ДИ':>22}{'медиана':>10}")
+    for length in lengths:
+        count = max(1, MIN_RUN_PIXELS // length)
+        for algo in algos:
+            circles = algo in CIRCLE_ALGOS or algo == "bresenham_circles"
+            if algo in BATCH_ALGOS:
+                func, algo_sinks = BATCH_ALGOS[algo], ["batch"]
+            else:
+                func = getattr(RasterLabApp, {**LINE_ALGOS, **CIRCLE_ALGOS}[algo])
+                algo_sinks = sinks
+            for sink in algo_sinks:
+                ns, total = [], 0
+                for _ in range(runs):
+                    prims = (random_circles if circles else random_segments)(rng, length, count)
+                    pixels = pixel_count(prims, circles)
+                    ns.append(time_run(func, prims, sink, pixels) / pixels * 1e9)
+                    total += pixels
+                mean, lo, hi, median = summarize(ns)
+                rows.append({"algorithm": algo, "sink": sink, "length": length, "runs": runs,
+                             "pixels": total, "mean_ns": mean, "ci_low_ns": lo, "ci_high_ns": hi,
+                             "median_ns": median})
+                print(f"{algo:<20}{sink:<9}{length:>9}{mean:>11.1f}{f'[{lo:.1f}, {hi:.1f}]':>22}{median:>10.1f}")
+    return rows
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    all_algos = list(LINE_ALGOS) + list(CIRCLE_ALGOS) + list(BATCH_ALGOS)
+    parser = argparse.ArgumentParser(description="Время алгоритмов растеризации lab3 без отрисовки")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000, 1000000],
+                        help="длины примитивов в пикселях")
+    parser.add_argument("--runs", type=int, default=10, help="запусков на каждую длину")
+    parser.add_argument("--sinks", nargs="+", choices=["noop", "array"], default=["noop", "array"])
+    parser.add_argument("--algos", nargs="+", choices=all_algos, default=all_algos)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", default=None, help="сохранить результаты в CSV")
+    args = parser.parse_args()
+    results = bench(args.lengths, args.runs, args.sinks, args.algos, args.seed)
+    if args.csv:
+        write_csv(args.csv, results)
+        print(f"CSV: {args.csv}")
@@ -1,6 +1,28 @@
 import tkinter as tk
 from tkinter import ttk
 import colorsys
+import glob
+import hashlib
+import inspect
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+
+PICKER_SIZE = 256
+HUE_STEPS = 360       # квантование оттенка для кэша SL-квадратов
+SL_CACHE_SIZE = 64    # сколько SL-квадратов держать в памяти
+FRAME_MS = 16         # не больше одного пересчёта за кадр (~60 fps)
+
+# Таблицы RGB -> CMYK/HLS на все 2^24 цветов
+LUT_FORMAT_VERSION = 1
+LUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lut_cache")
+CMYK_LUT_SCALE = 255                 # uint8: C, M, Y, K * 255
+HLS_LUT_SCALE = (100, 10000, 10000)  # uint16: H в сотых градуса, L и S * 10000
+
+# Цветоделение: изображение обрабатывается полосами примерно по столько пикселей
+STRIP_PIXELS = 1 << 20
+PLATE_NAMES = "CMYK"
 
 def cmyk_to_rgb(c, m, y, k):
     r = 255 * (1 - c) * (1 - k)
@@ -18,6 +40,265 @@ def rgb_to_cmyk(r, g, b):
     y = (1 - b - k) / (1 - k)
     return c, m, y, k
 
+# ========== Пакетные преобразования (NumPy) ==========
+# Те же формулы, что и у скалярных функций выше, но сразу для массива цветов:
+# RGB — (N,3) в диапазоне 0..255, CMYK — (N,4) в 0..1,
+# HLS — (N,3): H в градусах [0, 360), L и S в 0..1 (как в ColorConverterApp).
+def cmyk_to_rgb_batch(cmyk):
+    cmyk = np.asarray(cmyk, dtype=np.float64).reshape(-1, 4)
+    c, m, y, k = cmyk[:, 0], cmyk[:, 1], cmyk[:, 2], cmyk[:, 3]
+    rgb = np.empty((len(cmyk), 3))
+    rgb[:, 0] = 255 * (1 - c) * (1 - k)
+    rgb[:, 1] = 255 * (1 - m) * (1 - k)
+    rgb[:, 2] = 255 * (1 - y) * (1 - k)
+    # np.rint, как и round(), округляет половины к чётному
+    return np.rint(rgb).astype(np.int64)
+
+def rgb_to_cmyk_batch(rgb):
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3) / 255.0
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    k = 1 - rgb.max(axis=1)
+    black = k == 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cmyk = np.stack([
+            (1 - r - k) / (1 - k),
+            (1 - g - k) / (1 - k),
+            (1 - b - k) / (1 - k),
+            k,
+        ], axis=1)
+    cmyk[black] = (0.0, 0.0, 0.0, 1.0)
+    return cmyk
+
+def rgb_to_hls_batch(rgb):
+    # Повторяет colorsys.rgb_to_hls поэлементно
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3) / 255
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    gray = minc == maxc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(l <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    h = np.select([r == maxc, g == maxc], [bc - gc, 2.0 + rc - bc], 4.0 + gc - rc)
+    h = (h / 6.0) % 1.0
+    h[gray] = 0.0
+    s[gray] = 0.0
+    return np.stack([h * 360, l, s], axis=1)
+
+def _hls_channel(m1, m2, hue):
+    # Векторная версия colorsys._v
+    hue = hue % 1.0
+    return np.select(
+        [hue < colorsys.ONE_SIXTH, hue < 0.5, hue < colorsys.TWO_THIRD],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (colorsys.TWO_THIRD - hue) * 6.0],
+        m1,
+    )
+
+def hls_to_rgb_batch(hls):
+    # Повторяет colorsys.hls_to_rgb + округление из update_all_from_hls
+    hls = np.asarray(hls, dtype=np.float64).reshape(-1, 3)
+    h = (hls[:, 0] % 360) / 360.0
+    l, s = hls[:, 1], hls[:, 2]
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+    rgb = np.stack([
+        _hls_channel(m1, m2, h + colorsys.ONE_THIRD),
+        _hls_channel(m1, m2, h),
+        _hls_channel(m1, m2, h - colorsys.ONE_THIRD),
+    ], axis=1)
+    gray = s == 0.0
+    rgb[gray] = l[gray, np.newaxis]
+    return np.rint(rgb * 255).astype(np.int64)
+
+def cmyk_to_hls_batch(cmyk):
+    return rgb_to_hls_batch(cmyk_to_rgb_batch(cmyk))
+
+def hls_to_cmyk_batch(hls):
+    return rgb_to_cmyk_batch(hls_to_rgb_batch(hls))
+
+# ========== Таблицы на все 24-битные цвета ==========
+# Таблица — .npy на 2^24 строк, индекс цвета (r << 16) | (g << 8) | b.
+# В имени файла версия формата и хэш формул: если формулы поменялись,
+# старые таблицы не подойдут и будут построены заново.
+def quantize_cmyk(cmyk):
+    return np.rint(cmyk * CMYK_LUT_SCALE).astype(np.uint8)
+
+def quantize_hls(hls):
+    q = np.rint(hls * np.array(HLS_LUT_SCALE))
+    q[:, 0] %= 360 * HLS_LUT_SCALE[0]
+    return q.astype(np.uint16)
+
+def lut_fingerprint():
+    h = hashlib.sha256(str(LUT_FORMAT_VERSION).encode())
+    for func in (rgb_to_cmyk_batch, rgb_to_hls_batch, quantize_cmyk, quantize_hls):
+        h.update(inspect.getsource(func).encode())
+    h.update(repr((CMYK_LUT_SCALE, HLS_LUT_SCALE)).encode())
+    return h.hexdigest()[:16]
+
+def lut_path(name, directory=LUT_DIR):
+    return os.path.join(directory, f"rgb_{name}_v{LUT_FORMAT_VERSION}_{lut_fingerprint()}.npy")
+
+def build_lut_tables(directory=LUT_DIR):
+    # Пишем таблицы по 65536 цветов (один R за раз) прямо в файл — в памяти
+    # целиком они не держатся. Готовый файл появляется атомарно через os.replace.
+    os.makedirs(directory, exist_ok=True)
+    gb = np.arange(256 * 256)
+    block = np.empty((len(gb), 3), dtype=np.int64)
+    block[:, 1] = gb >> 8
+    block[:, 2] = gb & 0xFF
+    specs = [
+        ("cmyk", 4, np.uint8, lambda rgb: quantize_cmyk(rgb_to_cmyk_batch(rgb))),
+        ("hls", 3, np.uint16, lambda rgb: quantize_hls(rgb_to_hls_batch(rgb))),
+    ]
+    for name, width, dtype, convert in specs:
+        path = lut_path(name, directory)
+        tmp = path + ".tmp"
+        table = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(1 << 24, width))
+        for r in range(256):
+            block[:, 0] = r
+            table[r << 16:(r + 1) << 16] = convert(block)
+        table.flush()
+        del table
+        os.replace(tmp, path)
+        # Таблицы от прежних версий формул больше не нужны
+        for old in glob.glob(os.path.join(directory, f"rgb_{name}_v*.npy")):
+            if old != path:
+                os.remove(old)
+
+_lut_tables = {}
+
+def load_lut_tables(directory=LUT_DIR):
+    tables = _lut_tables.get(directory)
+    if tables is None:
+        paths = {name: lut_path(name, directory) for name in ("cmyk", "hls")}
+        if not all(os.path.exists(p) for p in paths.values()):
+            build_lut_tables(directory)
+        tables = {name: np.load(p, mmap_mode="r") for name, p in paths.items()}
+        _lut_tables[directory] = tables
+    return tables
+
+def rgb_index(rgb):
+    rgb = np.asarray(rgb).reshape(-1, 3).astype(np.int64)
+    # Без проверки (0, 256, 0) молча попал бы в запись (1, 0, 0)
+    if rgb.size and (rgb.min() < 0 or rgb.max() > 255):
+        raise ValueError("Значения RGB должны быть в диапазоне 0..255")
+    return (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+
+def rgb_to_cmyk_lut(rgb, quantized=False, directory=LUT_DIR):
+    q = load_lut_tables(directory)["cmyk"][rgb_index(rgb)]
+    return q if quantized else q / CMYK_LUT_SCALE
+
+def rgb_to_hls_lut(rgb, quantized=False, directory=LUT_DIR):
+    q = load_lut_tables(directory)["hls"][rgb_index(rgb)]
+    return q if quantized else q / np.array(HLS_LUT_SCALE)
+
+# ========== Растровые данные для селектора ==========
+def sl_square_rgb(hue, size=PICKER_SIZE):
+    # Строки — L от 1 до 0, столбцы — S от 0 до 1 (как в on_sl_click)
+    t = np.arange(size) / (size - 1)
+    light, sat = np.meshgrid(1.0 - t, t, indexing="ij")
+    hls = np.stack([np.full(light.size, hue), light.ravel(), sat.ravel()], axis=1)
+    return hls_to_rgb_batch(hls).reshape(size, size, 3).astype(np.uint8)
+
+def rgb_to_ppm(arr):
+    # Двоичный PPM (P6) — его tk.PhotoImage принимает напрямую, без PIL
+    h, w = arr.shape[:2]
+    return b"P6 %d %d 255\n" % (w, h) + np.ascontiguousarray(arr, dtype=np.uint8).tobytes()
+
+# ========== Цветоделение изображений ==========
+# Формы C, M, Y, K пишутся 8-битными PGM (255 = 100% краски), композит — PPM.
+# PNM — это заголовок и сырые байты, поэтому и чтение, и запись идут через
+# np.memmap полосами: в памяти одновременно находится только одна полоса.
+def read_pnm_header(path):
+    with open(path, "rb") as f:
+        data = f.read(512)
+    tokens, pos = [], 0
+    while len(tokens) < 4:
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b"#":
+            pos = data.find(b"\n", pos) + 1 or len(data)
+            continue
+        end = pos
+        while end < len(data) and not data[end:end + 1].isspace():
+            end += 1
+        # Заголовок оборвался: последний токен должен закрываться пробельным символом
+        if end >= len(data):
+            raise ValueError(f"Неполный заголовок PNM: {path}")
+        tokens.append(data[pos:end])
+        pos = end
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if magic not in (b"P5", b"P6") or maxval != 255:
+        raise ValueError(f"Поддерживаются только 8-битные P5/P6: {path}")
+    channels = 1 if magic == b"P5" else 3
+    return pos + 1, width, height, channels
+
+def open_pnm(path):
+    offset, width, height, channels = read_pnm_header(path)
+    shape = (height, width) if channels == 1 else (height, width, 3)
+    return np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+
+def create_pnm(path, width, height, channels):
+    header = b"P%d %d %d 255\n" % (5 if channels == 1 else 6, width, height)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + width * height * channels)
+    shape = (height, width) if channels == 1 else (height, width, 3)
+    return np.memmap(path, dtype=np.uint8, mode="r+", offset=len(header), shape=shape)
+
+def open_rgb_image(src):
+    # Массив, .npy или PNM открываются без чтения целиком; прочие форматы — через PIL
+    if isinstance(src, np.ndarray):
+        return src
+    ext = os.path.splitext(src)[1].lower()
+    if ext == ".npy":
+        return np.load(src, mmap_mode="r")
+    if ext in (".ppm", ".pgm", ".pnm"):
+        return open_pnm(src)
+    from PIL import Image
+    return np.asarray(Image.open(src).convert("RGB"))
+
+def strip_rows(width, strip_pixels=STRIP_PIXELS):
+    return max(1, strip_pixels // max(1, width))
+
+def separate_cmyk_plates(src, out_prefix, strip_pixels=STRIP_PIXELS):
+    img = open_rgb_image(src)
+    height, width = img.shape[:2]
+    paths = [f"{out_prefix}_{name}.pgm" for name in PLATE_NAMES]
+    plates = [create_pnm(path, width, height, 1) for path in paths]
+    step = strip_rows(width, strip_pixels)
+    for y0 in range(0, height, step):
+        y1 = min(height, y0 + step)
+        strip = img[y0:y1]
+        if strip.ndim == 2:
+            # Полутоновый источник (P5): серый разворачивается в R = G = B
+            strip = np.repeat(strip[..., None], 3, axis=2)
+        cmyk = quantize_cmyk(rgb_to_cmyk_batch(strip.reshape(-1, 3)))
+        for i, plate in enumerate(plates):
+            plate[y0:y1] = cmyk[:, i].reshape(y1 - y0, width)
+    for plate in plates:
+        plate.flush()
+    return paths
+
+def composite_cmyk_plates(plate_paths, out_path, strip_pixels=STRIP_PIXELS):
+    plates = [open_pnm(path) for path in plate_paths]
+    if len(plates) != 4 or any(p.shape != plates[0].shape or p.ndim != 2 for p in plates):
+        raise ValueError("Нужны четыре одинаковые по размеру формы C, M, Y, K")
+    height, width = plates[0].shape
+    out = create_pnm(out_path, width, height, 3)
+    step = strip_rows(width, strip_pixels)
+    for y0 in range(0, height, step):
+        y1 = min(height, y0 + step)
+        cmyk = np.stack([p[y0:y1].ravel() for p in plates], axis=1) / CMYK_LUT_SCALE
+        out[y0:y1] = cmyk_to_rgb_batch(cmyk).reshape(y1 - y0, width, 3)
+    out.flush()
+    return out_path
+
 class ColorConverterApp:
     def __init__(self, root):
         self.root = root
@@ -25,7 +306,14 @@ class ColorConverterApp:
         self.root.geometry("800x700")
         self.updating = False
 
+        # Планировщик: события за кадр сливаются в один пересчёт
+        self.pending_update = None
+        self.update_job = None
+        self.last_flush = 0.0
+        self.dropped_events = 0
+
         self.hls = [0.0, 0.5, 1.0]  # H, L, S
+        self.sl_images = OrderedDict()  # квантованный оттенок -> PhotoImage
         self.create_widgets()
         self.update_all_from_hls()
         self.redraw_color_picker()
@@ -46,6 +334,7 @@ class ColorConverterApp:
         self.sl_canvas.pack(side="left")
         self.sl_canvas.bind("<Button-1>", self.on_sl_click)
         self.sl_canvas.bind("<B1-Motion>", self.on_sl_click)
+        self.create_picker_items()
 
         # ========== Панели моделей с ПОЛЗУНКАМИ и полями ==========
         models_frame = ttk.Frame(self.root)
@@ -115,12 +404,39 @@ class ColorConverterApp:
         if not self.updating:
             func()
 
+    # ========== Планировщик обновлений ==========
+    def schedule_update(self, func, same_event=None):
+        # Выполнится только последний запрос за кадр, остальные считаются отброшенными.
+        # Шаг ttk.Scale сначала пишет переменную (trace -> commit_*), потом вызывает
+        # command — это одно событие: замена его же запроса same_event не считается
+        if self.pending_update is not None and self.pending_update != same_event:
+            self.dropped_events += 1
+        self.pending_update = func
+        if self.update_job is None:
+            delay = FRAME_MS - int((time.perf_counter() - self.last_flush) * 1000)
+            if delay > 0:
+                self.update_job = self.root.after(delay, self.flush_updates)
+            else:
+                self.update_job = self.root.after_idle(self.flush_updates)
+
+    def flush_updates(self):
+        if self.update_job is not None:
+            self.root.after_cancel(self.update_job)
+            self.update_job = None
+        func, self.pending_update = self.pending_update, None
+        if func is not None:
+            self.last_flush = time.perf_counter()
+            func()
+
     # --- RGB ---
     def on_rgb_slider(self, idx):
-        self.update_if_not_updating(lambda: self.process_rgb())
+        self.update_if_not_updating(lambda: self.schedule_update(self.process_rgb, self.commit_rgb_entry))
 
     def on_rgb_entry(self, idx):
         if self.updating: return
+        self.schedule_update(self.commit_rgb_entry)
+
+    def commit_rgb_entry(self):
         try:
             r = max(0, min(255, self.rgb_vars[0].get()))
             g = max(0, min(255, self.rgb_vars[1].get()))
@@ -140,10 +456,13 @@ class ColorConverterApp:
 
     # --- CMYK ---
     def on_cmyk_slider(self, idx):
-        self.update_if_not_updating(lambda: self.process_cmyk())
+        self.update_if_not_updating(lambda: self.schedule_update(self.process_cmyk, self.commit_cmyk_entry))
 
     def on_cmyk_entry(self, idx):
         if self.updating: return
+        self.schedule_update(self.commit_cmyk_entry)
+
+    def commit_cmyk_entry(self):
         try:
             vals = [max(0.0, min(1.0, v.get())) for v in self.cmyk_vars]
             for i, val in enumerate(vals):
@@ -161,14 +480,19 @@ class ColorConverterApp:
 
     # --- HLS ---
     def on_hls_slider(self, idx):
-        self.update_if_not_updating(lambda: self.process_hls())
+        self.update_if_not_updating(lambda: self.schedule_update(self.process_hls, self.commit_hls_entry))
 
     def on_hls_entry(self, idx):
         if self.updating: return
+        self.schedule_update(self.commit_hls_entry)
+
+    def commit_hls_entry(self):
+        # Запросы по разным полям за один кадр сливаются, поэтому проверяем все три
         try:
-            val = float(self.hls_vars[idx].get())
-            val = max(0.0, min(self.hls_max[idx], val))
-            self.safe_set(self.hls_vars[idx], val, 2)
+            for idx, var in enumerate(self.hls_vars):
+                val = float(var.get())
+                val = max(0.0, min(self.hls_max[idx], val))
+                self.safe_set(var, val, 2)
             self.process_hls()
         except Exception:
             pass
@@ -184,14 +508,14 @@ class ColorConverterApp:
     def on_hue_click(self, event):
         y = min(255, max(0, event.y))
         self.hls[0] = 360 * (255 - y) / 255
-        self.update_all_from_hls()
+        self.schedule_update(self.update_all_from_hls)
 
     def on_sl_click(self, event):
         x = min(255, max(0, event.x))
         y = min(255, max(0, event.y))
         self.hls[2] = x / 255.0          # Saturation
         self.hls[1] = 1.0 - y / 255.0    # Lightness
-        self.update_all_from_hls()
+        self.schedule_update(self.update_all_from_hls)
 
     # ========== Обновление всего ==========
     def update_all_from_hls(self):
@@ -223,47 +547,60 @@ class ColorConverterApp:
         self.redraw_color_picker()
 
     # ========== Быстрая отрисовка с курсорами ==========
+    def get_sl_image(self, hue):
+        key = int(round((hue % 360) * HUE_STEPS / 360)) % HUE_STEPS
+        img = self.sl_images.get(key)
+        if img is not None:
+            self.sl_images.move_to_end(key)
+            return img
+        rgb = sl_square_rgb(key * 360 / HUE_STEPS)
+        img = tk.PhotoImage(master=self.sl_canvas, data=rgb_to_ppm(rgb), format="PPM")
+        self.sl_images[key] = img
+        if len(self.sl_images) > SL_CACHE_SIZE:
+            self.sl_images.popitem(last=False)
+        return img
+
+    def create_picker_items(self):
+        # Элементы холстов создаются один раз, дальше только двигаются
+        strip = np.empty((PICKER_SIZE, 30, 3), dtype=np.uint8)
+        for i in range(PICKER_SIZE):
+            h_val = (360 - 360 * i / 255) / 360.0
+            rgb = colorsys.hls_to_rgb(h_val, 0.5, 1.0)
+            strip[i] = [int(rgb[0]*255), int(rgb[1]*255), int(rgb[2]*255)]
+        self.hue_strip = tk.PhotoImage(master=self.hue_canvas, data=rgb_to_ppm(strip), format="PPM")
+        self.hue_canvas.create_image(0, 0, anchor="nw", image=self.hue_strip)
+
+        # Курсор на Hue-ползунке: белая подложка и чёрная линия
+        self.hue_cursor = [
+            self.hue_canvas.create_line(0, 0, 30, 0, fill="white", width=2),
+            self.hue_canvas.create_line(0, 0, 30, 0, fill="black", width=1),
+        ]
+
+        self.sl_image_item = self.sl_canvas.create_image(0, 0, anchor="nw")
+        # Крестик: белый (толстый) под чёрным (тонким), по горизонтали и вертикали
+        self.sl_cross = []
+        for color, width in (("white", 2), ("black", 1)):
+            self.sl_cross.append(self.sl_canvas.create_line(0, 0, 0, 0, fill=color, width=width))
+            self.sl_cross.append(self.sl_canvas.create_line(0, 0, 0, 0, fill=color, width=width))
+
     def redraw_color_picker(self):
         hue = self.hls[0]
-        h_norm = (hue % 360) / 360.0
-        w, h_canvas = 256, 256
-
-        self.hue_canvas.delete("all")
-        self.sl_canvas.delete("all")
 
-        # Hue-градиент
-        for i in range(256):
-            h_val = (360 - 360 * i / 255) / 360.0
-            rgb = colorsys.hls_to_rgb(h_val, 0.5, 1.0)
-            col = f"#{int(rgb[0]*255):02x}{int(rgb[1]*255):02x}{int(rgb[2]*255):02x}"
-            self.hue_canvas.create_line(0, i, 30, i, fill=col)
-
-        # SL-квадрат (блоки 8x8)
-        block = 8
-        for y in range(0, h_canvas, block):
-            light = 1.0 - (y + block/2) / h_canvas
-            for x in range(0, w, block):
-                sat = (x + block/2) / w
-                r, g, b = colorsys.hls_to_rgb(h_norm, light, sat)
-                col = f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
-                self.sl_canvas.create_rectangle(x, y, x+block, y+block, fill=col, outline="")
+        # SL-квадрат — одно изображение 256x256 из кэша
+        self.sl_canvas.itemconfig(self.sl_image_item, image=self.get_sl_image(hue))
 
         # === Курсор на Hue-ползунке ===
         hue_y = 255 - (hue % 360) * 255 / 360
-        self.hue_canvas.create_line(0, hue_y, 30, hue_y, fill="white", width=2)
-        self.hue_canvas.create_line(0, hue_y, 30, hue_y, fill="black", width=1)
+        for item in self.hue_cursor:
+            self.hue_canvas.coords(item, 0, hue_y, 30, hue_y)
 
         # === Крестик в SL-квадрате ===
-        sat_x = self.hls[2] * 255
-        light_y = (1.0 - self.hls[1]) * 255
-        cx, cy = sat_x, light_y
+        cx = self.hls[2] * 255
+        cy = (1.0 - self.hls[1]) * 255
         size = 5
-        # Белый крест (толстый)
-        self.sl_canvas.create_line(cx - size, cy, cx + size, cy, fill="white", width=2)
-        self.sl_canvas.create_line(cx, cy - size, cx, cy + size, fill="white", width=2)
-        # Чёрный контур (тонкий)
-        self.sl_canvas.create_line(cx - size, cy, cx + size, cy, fill="black", width=1)
-        self.sl_canvas.create_line(cx, cy - size, cx, cy + size, fill="black", width=1)
+        for i in range(0, len(self.sl_cross), 2):
+            self.sl_canvas.coords(self.sl_cross[i], cx - size, cy, cx + size, cy)
+            self.sl_canvas.coords(self.sl_cross[i + 1], cx, cy - size, cx, cy + size)
 
 # ========== Запуск ==========
 if __name__ == "__main__":
@@ -1,117 +1,992 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
+from PIL import Image
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from numpy.lib.stride_tricks import sliding_window_view
 
+# Tk, ImageTk и matplotlib нужны только окну и подгружаются в _import_gui:
+# алгоритмы lab2 импортируются быстро (в т.ч. в рабочих процессах)
+tk = filedialog = messagebox = ttk = ImageTk = Figure = FigureCanvasTkAgg = None
 
-def median_filter_rgb(img, k=5):
+
+MEDIAN_BLOCK_BYTES = 1 << 26  # сколько байт окон разворачивать за один блок строк
+MEDIAN_HIST_MIN_K = 15        # с такого окна гистограммный вариант быстрее
+MEDIAN_TILE = 512             # сторона плитки при многопроцессной обработке
+STREAM_STRIP_PIXELS = 1 << 22  # пикселей в одной полосе при обработке в полном разрешении
+HSV_STRIP_PIXELS = 1 << 18     # полоса для слитного RGB -> HSV -> RGB
+LUT_STRIP_PIXELS = 1 << 18     # полоса для таблиц и гистограмм (np.take и bincount расширяют индексы до int64)
+PREVIEW_SIZE = (400, 400)
+POLL_MS = 50                   # как часто окно проверяет фоновую задачу
+RESULT_CACHE_BYTES = 512 << 20 # предел памяти кэша промежуточных результатов
+
+# Длинные операции принимают progress(done, total). Вызов может бросить
+# CancelledError — так фоновая задача останавливается на ближайшей проверке.
+
+
+def _pad_edge(img, pad):
+    if img.ndim == 3:
+        return np.pad(img, ((pad, pad), (pad, pad), (0, 0)), mode='edge')
+    return np.pad(img, pad, mode='edge')
+
+
+def _block_rows(w, channels, k, itemsize=1):
+    return max(1, MEDIAN_BLOCK_BYTES // (w * channels * k * k * itemsize))
+
+
+def _median_window(padded, k, out, block_rows=None, progress=None):
+    # Все окна k×k как представление без копирования; копируется
+    # (и частично сортируется) только текущий блок строк
+    h, w = out.shape[:2]
+    channels = out.shape[2] if out.ndim == 3 else 1
+    windows = sliding_window_view(padded, (k, k), axis=(0, 1))
+    mid = (k * k) // 2
+    step = block_rows or _block_rows(w, channels, k, padded.itemsize)
+    for y0 in range(0, h, step):
+        y1 = min(h, y0 + step)
+        block = windows[y0:y1].reshape(out[y0:y1].shape + (k * k,))
+        out[y0:y1] = np.partition(block, mid, axis=-1)[..., mid]
+        if progress:
+            progress(y1, h)
+
+
+def _median_hist(padded, k, out, block_rows=None, progress=None):
+    # Медиана через гистограмму окна: для каждого уровня v считаем, сколько
+    # пикселей окна <= v (сумма по окну через интегральное изображение, O(1)
+    # на пиксель при любом k). Медиана — число уровней, где таких пикселей
+    # не больше mid. Стоимость не зависит от k, только от числа уровней.
+    h, w = out.shape[:2]
+    mid = (k * k) // 2
+    step = block_rows or max(1, MEDIAN_BLOCK_BYTES // (16 * (w + k)))
+    planes = [(padded[..., c], out[..., c]) for c in range(out.shape[2])] if out.ndim == 3 else [(padded, out)]
+    total = h * len(planes)
+    for p, (src, dst) in enumerate(planes):
+        for y0 in range(0, h, step):
+            y1 = min(h, y0 + step)
+            block = src[y0:y1 + k - 1]
+            lo, hi = int(block.min()), int(block.max())
+            res = np.full((y1 - y0, w), lo, dtype=np.int32)
+            integral = np.zeros((block.shape[0] + 1, block.shape[1] + 1), dtype=np.int32)
+            for v in range(lo, hi):
+                if progress:
+                    progress(p * h + y0 + (y1 - y0) * (v - lo) / (hi - lo), total)
+                np.cumsum(block <= v, axis=0, out=integral[1:, 1:])
+                np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+                count = (integral[k:, k:] - integral[:-k, k:]
+                         - integral[k:, :-k] + integral[:-k, :-k])
+                res += count <= mid
+            dst[y0:y1] = res
+
+
+def _median_tile(task):
+    # Выполняется в процессе-обработчике: массивы берутся из общей памяти
+    # по имени, через pickle передаются только имена, формы и границы плитки
+    pad_name, out_name, pad_shape, out_shape, dtype, k, method, y0, y1, x0, x1 = task
+    pad_shm = shared_memory.SharedMemory(name=pad_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        padded = np.ndarray(pad_shape, dtype=dtype, buffer=pad_shm.buf)
+        out = np.ndarray(out_shape, dtype=dtype, buffer=out_shm.buf)
+        kernel = _median_hist if method == "hist" else _median_window
+        # Плитка входа шире плитки выхода на k//2 с каждой стороны
+        kernel(padded[y0:y1 + k - 1, x0:x1 + k - 1], k, out[y0:y1, x0:x1])
+        del padded, out
+    finally:
+        pad_shm.close()
+        out_shm.close()
+
+
+def _median_parallel(padded, k, out, method, workers, progress=None):
+    h, w = out.shape[:2]
+    pad_shm = shared_memory.SharedMemory(create=True, size=padded.nbytes)
+    out_shm = shared_memory.SharedMemory(create=True, size=max(1, out.nbytes))
+    try:
+        np.ndarray(padded.shape, dtype=padded.dtype, buffer=pad_shm.buf)[...] = padded
+        tasks = [
+            (pad_shm.name, out_shm.name, padded.shape, out.shape, padded.dtype, k, method,
+             y0, min(h, y0 + MEDIAN_TILE), x0, min(w, x0 + MEDIAN_TILE))
+            for y0 in range(0, h, MEDIAN_TILE)
+            for x0 in range(0, w, MEDIAN_TILE)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_median_tile, task) for task in tasks]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    if progress:
+                        progress(done, len(futures))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        out[...] = np.ndarray(out.shape, dtype=out.dtype, buffer=out_shm.buf)
+    finally:
+        pad_shm.close()
+        pad_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+
+def median_filter_rgb(img, k=5, method="auto", block_rows=None, workers=1, progress=None):
+    # method="window" — частичная сортировка скользящих окон (быстрее при малых k),
+    # method="hist" — гистограммный вариант для больших k (только uint8),
+    # method="auto" — выбирает между ними по k.
+    # workers > 1 — плитки обрабатываются пулом процессов (None — по числу ядер).
+    # Все дают тот же результат, что и поканальная медиана окна k×k с краями 'edge'.
     if k % 2 == 0:
         k += 1
+    if method == "auto":
+        method = "hist" if k >= MEDIAN_HIST_MIN_K else "window"
     pad = k // 2
-    h, w = img.shape[:2]
-    if img.ndim == 3:
-        padded = np.pad(img, ((pad, pad), (pad, pad), (0, 0)), mode='edge')
-        out = np.zeros_like(img)
-        mid = (k * k) // 2
-        for i in range(h):
-            for j in range(w):
-                window_r = padded[i:i+k, j:j+k, 0].ravel()
-                window_g = padded[i:i+k, j:j+k, 1].ravel()
-                window_b = padded[i:i+k, j:j+k, 2].ravel()
-                out[i, j, 0] = np.partition(window_r, mid)[mid]
-                out[i, j, 1] = np.partition(window_g, mid)[mid]
-                out[i, j, 2] = np.partition(window_b, mid)[mid]
+    padded = _pad_edge(img, pad)
+    out = np.zeros_like(img)
+    if method not in ("window", "hist"):
+        raise ValueError(f"Неизвестный метод медианного фильтра: {method}")
+    if img.dtype != np.uint8:
+        method = "window"
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and out.size:
+        _median_parallel(padded, k, out, method, workers, progress)
+    elif method == "hist":
+        _median_hist(padded, k, out, block_rows, progress)
     else:
-        padded = np.pad(img, pad, mode='edge')
-        out = np.zeros_like(img)
+        _median_window(padded, k, out, block_rows, progress)
+    return out.astype(np.uint8)
+
+
+def detect_impulses(img):
+    # Импульсный шум «соль-перец» — пиксели с крайними значениями канала
+    if img.ndim == 2:
+        return (img == img.min()) | (img == img.max())
+    mins = img.min(axis=(0, 1))
+    maxs = img.max(axis=(0, 1))
+    return (img == mins) | (img == maxs)
+
+
+def _adaptive_median_channel(channel, noisy, max_k, out, progress=None):
+    # Классический адаптивный медианный фильтр, но только для найденных
+    # импульсов: окно растёт 3, 5, ..., max_k, пока медиана сама не импульс
+    pad = max_k // 2
+    padded = _pad_edge(channel, pad)
+    pw = padded.shape[1]
+    ys, xs = np.nonzero(noisy)
+    centers = (ys + pad) * pw + (xs + pad)
+    flat = padded.ravel()
+    for k in range(3, max_k + 1, 2):
+        if not len(centers):
+            break
+        r = k // 2
+        dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+        offsets = (dy * pw + dx).ravel()
         mid = (k * k) // 2
-        for i in range(h):
-            for j in range(w):
-                window = padded[i:i+k, j:j+k].ravel()
-                out[i, j] = np.partition(window, mid)[mid]
+        chunk = max(1, MEDIAN_BLOCK_BYTES // (k * k * 8))
+        unresolved = []
+        for i in range(0, len(centers), chunk):
+            if progress:
+                progress(k - 3 + i / len(centers) * 2, max_k - 1)
+            c = centers[i:i + chunk]
+            win = flat[c[:, None] + offsets]
+            zmed = np.partition(win, mid, axis=1)[:, mid]
+            zmin = win.min(axis=1)
+            zmax = win.max(axis=1)
+            zxy = flat[c]
+            passed = (zmin < zmed) & (zmed < zmax)
+            value = np.where(passed & (zmin < zxy) & (zxy < zmax), zxy, zmed)
+            # На максимальном окне сдаёмся и берём медиану
+            done = passed | (k == max_k)
+            oy, ox = np.divmod(c[done], pw)
+            out[oy - pad, ox - pad] = value[done]
+            unresolved.append(c[~done])
+        centers = np.concatenate(unresolved)
+
+
+def adaptive_median_filter(img, max_k=7, progress=None):
+    # Обрабатываются только пиксели-импульсы, поэтому время растёт с
+    # плотностью шума, а не с размером изображения
+    if max_k % 2 == 0:
+        max_k += 1
+    max_k = max(3, max_k)
+    out = img.copy()
+    noisy = detect_impulses(img)
+    if img.ndim == 2:
+        _adaptive_median_channel(img, noisy, max_k, out, progress)
+    else:
+        channels = img.shape[2]
+        for c in range(channels):
+            # Прогресс канала (0..max_k-1) переводим в общий по всем каналам
+            part = progress and (lambda done, total, c=c: progress(c * total + done, channels * total))
+            _adaptive_median_channel(img[:, :, c], noisy[:, :, c], max_k, out[:, :, c], part)
     return out.astype(np.uint8)
 
 
-def linear_contrast(img):
-    f = img.astype(np.float32)
-    minv, maxv = f.min(), f.max()
+# ========== Гистограммы и статистика ==========
+# Гистограммы всех каналов за один проход: np.bincount по упакованному
+# индексу канал * 256 + значение. min/max и CDF выводятся из гистограмм.
+# Результат кэшируется (по слабой ссылке) только для массивов только для
+# чтения — результатов ResultCache, уровней пирамиды, memmap источника:
+# изменяемый массив могут поменять на месте, и кэш по id вернул бы старую
+# статистику. Для изменяемых массивов статистику передают явно (hist=, lo=, hi=).
+ImageStats = namedtuple("ImageStats", "hist cdf min max")
+
+STATS_CACHE_SIZE = 8
+_stats_cache = {}
+
+
+def channel_histograms(img, strip_pixels=LUT_STRIP_PIXELS):
+    channels = img.shape[2] if img.ndim == 3 else 1
+    flat = img.reshape(-1, channels)
+    hist = np.zeros(channels * 256, dtype=np.int64)
+    offsets = (np.arange(channels, dtype=np.uint16) * 256)
+    for i in range(0, len(flat), strip_pixels):
+        packed = flat[i:i + strip_pixels] + offsets
+        hist += np.bincount(packed.ravel(), minlength=channels * 256)
+    return hist.reshape(channels, 256)
+
+
+def stats_from_hist(hist):
+    nonzero = hist > 0
+    mins = nonzero.argmax(axis=1)
+    maxs = 255 - nonzero[:, ::-1].argmax(axis=1)
+    return ImageStats(hist, hist.cumsum(axis=1), mins, maxs)
+
+
+def image_stats(img):
+    if img.flags.writeable:
+        return stats_from_hist(channel_histograms(img))
+    entry = _stats_cache.get(id(img))
+    if entry is not None and entry[0]() is img:
+        return entry[1]
+    stats = stats_from_hist(channel_histograms(img))
+    if len(_stats_cache) >= STATS_CACHE_SIZE:
+        _stats_cache.pop(next(iter(_stats_cache)))
+    _stats_cache[id(img)] = (weakref.ref(img), stats)
+    return stats
+
+
+def invalidate_stats(img):
+    _stats_cache.pop(id(img), None)
+
+
+# ========== Точечные операции через таблицы ==========
+# Контраст, эквализация и гамма — функции одного байта, поэтому каждая
+# задаётся таблицей на 256 значений (по таблице на канал, форма (C, 256)).
+# Таблицы подряд идущих операций сворачиваются в одну, а гистограмма
+# промежуточного результата получается из исходной прямо по таблице,
+# так что цепочка применяется одним проходом по uint8 без float.
+POINT_OPS = ("contrast", "equalize_rgb", "gamma")
+IDENTITY_LUT = np.arange(256, dtype=np.uint8)
+
+
+def contrast_lut(lo, hi):
+    # Та же формула во float32, что и для пикселей, но на 256 значениях
+    f = IDENTITY_LUT.astype(np.float32)
+    minv, maxv = np.float32(lo), np.float32(hi)
     if maxv == minv:
-        return img.copy()
+        return IDENTITY_LUT.copy()
     return ((f - minv) / (maxv - minv) * 255).astype(np.uint8)
 
 
-def equalize_channel(c):
-    hist, _ = np.histogram(c, bins=256, range=(0, 256))
+def gamma_lut(gamma=1.0):
+    return np.rint(255 * (IDENTITY_LUT / 255.0) ** gamma).astype(np.uint8)
+
+
+def equalize_lut(hist):
+    # None — гистограмма из одного уровня, эквализировать нечего
     cdf = hist.cumsum()
     cdf_min = cdf[cdf > 0].min()
     if cdf[-1] == cdf_min:
+        return None
+    return ((cdf - cdf_min) * 255 / (cdf[-1] - cdf_min)).clip(0, 255).astype(np.uint8)
+
+
+def compose_luts(*luts):
+    # Сначала первая таблица, потом вторая и т.д.; формы (256,) и (C, 256)
+    # смешивать можно — результат по каналам
+    result = luts[0]
+    for lut in luts[1:]:
+        if lut.ndim == 1:
+            result = lut[result]
+        else:
+            result = np.stack([lut[c][result if result.ndim == 1 else result[c]] for c in range(len(lut))])
+    return result
+
+
+def lut_hist(hist, lut):
+    # Гистограмма после применения таблицы — без прохода по пикселям
+    lut = np.broadcast_to(lut, hist.shape)
+    return np.stack([np.bincount(lut[c], weights=hist[c], minlength=256) for c in range(len(hist))]).astype(np.int64)
+
+
+def point_lut(op, hist, **params):
+    # Таблица (C, 256) операции для изображения с гистограммами каналов hist
+    channels = len(hist)
+    if op == "contrast":
+        lo, hi = params.get("lo"), params.get("hi")
+        if lo is None or hi is None:
+            stats = stats_from_hist(hist)
+            lo, hi = stats.min.min(), stats.max.max()
+        return np.tile(contrast_lut(lo, hi), (channels, 1))
+    if op == "equalize_rgb":
+        own = params.get("hist")
+        own = hist if own is None else own
+        luts = [equalize_lut(hc) for hc in own]
+        return np.stack([IDENTITY_LUT if lut is None else lut for lut in luts])
+    if op == "gamma":
+        return np.tile(gamma_lut(**params), (channels, 1))
+    raise ValueError(f"Неизвестная точечная операция: {op}")
+
+
+def point_chain_lut(hist, steps):
+    # Одна таблица на всю цепочку точечных операций
+    lut = np.tile(IDENTITY_LUT, (len(hist), 1))
+    for op, params in steps:
+        step = point_lut(op, hist, **params)
+        lut = compose_luts(lut, step)
+        hist = lut_hist(hist, step)
+    return lut
+
+
+def apply_lut(img, lut, out=None, strip_pixels=LUT_STRIP_PIXELS):
+    # out=img — на месте. np.take переводит индексы uint8 в int64, поэтому
+    # изображение идёт полосами: временный буфер — 8 байт на пиксель полосы
+    if out is None:
+        out = np.empty_like(img)
+    h, w = img.shape[:2]
+    for y0, y1 in _strips(h, w, strip_pixels):
+        if lut.ndim == 1:
+            np.take(lut, img[y0:y1], out=out[y0:y1])
+        elif img.ndim == 2:
+            np.take(lut[0], img[y0:y1], out=out[y0:y1])
+        else:
+            for c in range(img.shape[2]):
+                np.take(lut[c], img[y0:y1, :, c], out=out[y0:y1, :, c])
+    if out is img:
+        invalidate_stats(img)
+    return out
+
+
+def apply_point_ops(img, steps, out=None):
+    return apply_lut(img, point_chain_lut(image_stats(img).hist, steps), out)
+
+
+def linear_contrast(img, lo=None, hi=None):
+    # lo/hi — готовые границы (например, от полного изображения для превью)
+    if img.dtype != np.uint8:
+        if lo is None or hi is None:
+            lo, hi = img.min(), img.max()
+        return _contrast_apply(img, lo, hi)
+    if lo is None or hi is None:
+        stats = image_stats(img)
+        lo, hi = stats.min.min(), stats.max.max()
+    return apply_lut(img, contrast_lut(lo, hi))
+
+
+def _contrast_apply(img, minv, maxv):
+    # Для не-uint8 изображений таблица неприменима
+    f = img.astype(np.float32)
+    minv, maxv = np.float32(minv), np.float32(maxv)
+    if maxv == minv:
+        return img.copy()
+    return ((f - minv) / (maxv - minv) * 255).astype(np.uint8)
+
+
+def equalize_channel(c, hist=None):
+    if hist is None:
+        hist = image_stats(c).hist[0]
+    lut = equalize_lut(hist)
+    if lut is None:
         return c
-    lut = ((cdf - cdf_min) * 255 / (cdf[-1] - cdf_min)).clip(0, 255).astype(np.uint8)
-    return lut[c]
+    return apply_lut(c, lut)
 
 
-def equalize_rgb(img):
-    if img.ndim == 2:
-        return equalize_channel(img)
-    return np.stack([equalize_channel(img[:, :, i]) for i in range(3)], axis=-1)
+def equalize_rgb(img, hist=None):
+    # hist — готовые гистограммы каналов (C, 256), иначе считаются по img
+    if hist is None:
+        hist = image_stats(img).hist
+    return apply_lut(img, point_lut("equalize_rgb", hist))
 
 
-def rgb_to_hsv(img):
-    img = img.astype(np.float32) / 255.0
-    r, g, b = img[:, :, 0], img[:, :, 1], img[:, :, 2]
-    vmax = np.max(img, axis=2)
-    vmin = np.min(img, axis=2)
-    diff = vmax - vmin
+def gamma_correct(img, gamma=1.0):
+    return apply_lut(img, gamma_lut(gamma))
 
-    h = np.zeros_like(vmax)
-    s = np.where(vmax == 0, 0, diff / vmax)
-    v = vmax
 
+def rgb_to_hsv(img, out=None):
+    # Все промежуточные плоскости float32 и считаются через out=/where=,
+    # каждая формула оттенка — только на своих пикселях
+    h, w = img.shape[:2]
+    if out is None:
+        out = np.empty((h, w, 3), dtype=np.float32)
+    rgb = np.empty((h, w, 3), dtype=np.float32)
+    np.divide(img, 255.0, out=rgb, dtype=np.float32)
+    r, g, b = rgb[:, :, 0], rgb[:, :, 1], rgb[:, :, 2]
+    hue, sat, val = out[:, :, 0], out[:, :, 1], out[:, :, 2]
+
+    np.maximum(r, g, out=val)
+    np.maximum(val, b, out=val)
+    diff = np.minimum(r, g)
+    np.minimum(diff, b, out=diff)
+    np.subtract(val, diff, out=diff)
+
+    sat[...] = 0
+    np.divide(diff, val, out=sat, where=val != 0)
+
+    # Если максимум совпадает у нескольких каналов, побеждает B, затем G
     mask = diff != 0
-    h[mask & (vmax == r)] = (60 * ((g - b) / diff) % 6)[mask & (vmax == r)]
-    h[mask & (vmax == g)] = (60 * ((b - r) / diff) + 2)[mask & (vmax == g)]
-    h[mask & (vmax == b)] = (60 * ((r - g) / diff) + 4)[mask & (vmax == b)]
-    h = np.clip(h, 0, 360)
+    m_b = mask & (val == b)
+    m_g = mask & (val == g) & ~m_b
+    m_r = mask & (val == r) & ~m_b & ~m_g
+    hue[...] = 0
+    for m, (x, y), add in ((m_r, (g, b), None), (m_g, (b, r), 2), (m_b, (r, g), 4)):
+        np.subtract(x, y, out=hue, where=m)
+        np.divide(hue, diff, out=hue, where=m)
+        np.multiply(hue, 60, out=hue, where=m)
+        if add is None:
+            np.remainder(hue, 6, out=hue, where=m)
+        else:
+            np.add(hue, add, out=hue, where=m)
+    np.clip(hue, 0, 360, out=hue)
+    return out
+
 
-    return np.stack([h, s, v], axis=-1)
+# Какая из величин (c, x, 0) идёт в R, G, B для каждого сектора оттенка 0..5
+_HSV_SECTORS = (
+    ((0, 5), (1, 4)),  # R: c, x
+    ((1, 2), (0, 3)),  # G: c, x
+    ((3, 4), (2, 5)),  # B: c, x
+)
 
 
-def hsv_to_rgb(hsv):
+def hsv_to_rgb(hsv, out=None):
     h, s, v = hsv[:, :, 0], hsv[:, :, 1], hsv[:, :, 2]
-    c = v * s
-    x = c * (1 - np.abs((h / 60) % 2 - 1))
-    m = v - c
+    if out is None:
+        out = np.empty(hsv.shape, dtype=np.uint8)
+    c = np.multiply(v, s)
+    x = np.divide(h, 60)
+    np.remainder(x, 2, out=x)
+    np.subtract(x, 1, out=x)
+    np.abs(x, out=x)
+    np.subtract(1, x, out=x)
+    np.multiply(c, x, out=x)
+    m = np.subtract(v, c)
+
+    sector = np.floor_divide(h, 60).astype(np.uint8)
+    np.remainder(sector, 6, out=sector)
+
+    buf = np.empty_like(c)
+    for ch, (c_sectors, x_sectors) in enumerate(_HSV_SECTORS):
+        buf[...] = 0
+        np.copyto(buf, c, where=(sector == c_sectors[0]) | (sector == c_sectors[1]))
+        np.copyto(buf, x, where=(sector == x_sectors[0]) | (sector == x_sectors[1]))
+        np.add(buf, m, out=buf)
+        np.multiply(buf, 255, out=buf)
+        np.clip(buf, 0, 255, out=buf)
+        np.copyto(out[:, :, ch], buf, casting='unsafe')
+    return out
+
+
+# V = max(R, G, B) / 255 во float32 и обратно в uint8 — это функция одного байта
+_V_U8 = (np.arange(256, dtype=np.float32) / 255.0 * 255).astype(np.uint8)
+
+
+def hsv_value_u8(img):
+    # То же, что (rgb_to_hsv(img)[:, :, 2] * 255).astype(np.uint8), но без H и S
+    return _V_U8[img.max(axis=2)]
+
+
+def _equalize_hsv_apply(img, lut, out=None, strip_pixels=HSV_STRIP_PIXELS, progress=None):
+    # Меняется только V: новое значение берётся из таблицы уже во float32
+    # (как при записи lut / 255.0 в массив HSV), H и S остаются как есть.
+    # Полосы с переиспользуемыми буферами держат память около размера выхода.
+    h, w = img.shape[:2]
+    if out is None:
+        out = np.empty((h, w, 3), dtype=np.uint8)
+    v_lut = (lut / 255.0).astype(np.float32)
+    step = max(1, strip_pixels // max(1, w))
+    hsv = np.empty((min(h, step), w, 3), dtype=np.float32)
+    for y0 in range(0, h, step):
+        y1 = min(h, y0 + step)
+        part = rgb_to_hsv(img[y0:y1], out=hsv[:y1 - y0])
+        v8 = np.multiply(part[:, :, 2], 255).astype(np.uint8)
+        np.take(v_lut, v8, out=part[:, :, 2])
+        hsv_to_rgb(part, out=out[y0:y1])
+        if progress:
+            progress(y1, h)
+    return out
+
+
+def _hsv_lut(hist):
+    # Даже без эквализации V квантуется до 8 бит, поэтому тождественная таблица
+    lut = equalize_lut(hist)
+    return np.arange(256, dtype=np.uint8) if lut is None else lut
+
+
+def equalize_hsv(img, v_hist=None, progress=None):
+    if v_hist is None:
+        v_hist = channel_histograms(hsv_value_u8(img))[0]
+    return _equalize_hsv_apply(img, _hsv_lut(v_hist), progress=progress)
+
+
+OPERATIONS = ("contrast", "equalize_rgb", "equalize_hsv", "gamma", "median", "adaptive_median")
+
+
+def apply_operation(img, op, progress=None, **params):
+    # Общая точка входа для кнопок окна и фоновых задач
+    if op == "contrast":
+        result = linear_contrast(img, **params)
+    elif op == "equalize_rgb":
+        result = equalize_rgb(img, **params)
+    elif op == "gamma":
+        result = gamma_correct(img, **params)
+    elif op == "equalize_hsv":
+        result = equalize_hsv(img, progress=progress, **params)
+    elif op == "median":
+        result = median_filter_rgb(img, progress=progress, **params)
+    elif op == "adaptive_median":
+        result = adaptive_median_filter(img, progress=progress, **params)
+    else:
+        raise ValueError(f"Неизвестная операция: {op}")
+    if progress:
+        progress(1, 1)
+    return result
 
-    rgb = np.zeros_like(hsv)
-    i = (h // 60).astype(int) % 6
-    rgb[i == 0] = np.stack([c, x, np.zeros_like(c)], axis=-1)[i == 0]
-    rgb[i == 1] = np.stack([x, c, np.zeros_like(c)], axis=-1)[i == 1]
-    rgb[i == 2] = np.stack([np.zeros_like(c), c, x], axis=-1)[i == 2]
-    rgb[i == 3] = np.stack([np.zeros_like(c), x, c], axis=-1)[i == 3]
-    rgb[i == 4] = np.stack([x, np.zeros_like(c), c], axis=-1)[i == 4]
-    rgb[i == 5] = np.stack([c, np.zeros_like(c), x], axis=-1)[i == 5]
 
-    rgb = (rgb + m[:, :, np.newaxis]) * 255
-    return np.clip(rgb, 0, 255).astype(np.uint8)
+# ========== Обработка в полном разрешении (по полосам) ==========
+# Изображение лежит в .npy и открывается через np.memmap; операции идут
+# полосами по STREAM_STRIP_PIXELS пикселей, поэтому пиковая память
+# ограничена размером полосы, а не изображения. Статистика для контраста
+# и эквализации собирается отдельным проходом по всему изображению.
+STREAM_OPS = ("contrast", "equalize_rgb", "equalize_hsv", "gamma", "median")
 
 
-def equalize_hsv(img):
-    hsv = rgb_to_hsv(img)
-    v_eq = equalize_channel((hsv[:, :, 2] * 255).astype(np.uint8))
-    hsv[:, :, 2] = v_eq / 255.0
-    return hsv_to_rgb(hsv)
+def _strips(h, w, strip_pixels=STREAM_STRIP_PIXELS):
+    step = max(1, strip_pixels // max(1, w))
+    for y0 in range(0, h, step):
+        yield y0, min(h, y0 + step)
+
+
+def decode_to_npy(path, npy_path, strip_pixels=STREAM_STRIP_PIXELS):
+    # PIL распаковывает файл целиком, но в .npy он переписывается полосами,
+    # и дальше вся работа идёт уже с memmap
+    pil_img = Image.open(path).convert("RGB")
+    w, h = pil_img.size
+    out = np.lib.format.open_memmap(npy_path, mode="w+", dtype=np.uint8, shape=(h, w, 3))
+    for y0, y1 in _strips(h, w, strip_pixels):
+        out[y0:y1] = np.asarray(pil_img.crop((0, y0, w, y1)))
+    out.flush()
+    del out
+    return np.load(npy_path, mmap_mode="r")
+
+
+def open_image_buffer(path, work_dir=None):
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    # Каждая загрузка получает свой файл: одноимённый вход не должен обрезать
+    # .npy, который ещё отображён в память у текущего изображения
+    stem = os.path.splitext(os.path.basename(path))[0]
+    fd, npy_path = tempfile.mkstemp(suffix=".npy", prefix=stem + "_", dir=work_dir)
+    os.close(fd)
+    try:
+        return decode_to_npy(path, npy_path)
+    except BaseException:
+        os.remove(npy_path)
+        raise
+
+
+def downsample2(img, strip_pixels=STREAM_STRIP_PIXELS):
+    # Следующий уровень пирамиды: среднее по блокам 2×2, полосами (годится для memmap)
+    h, w = img.shape[:2]
+    h2, w2 = h // 2, w // 2
+    out = np.empty((h2, w2) + img.shape[2:], dtype=np.uint8)
+    step = max(1, strip_pixels // max(1, 2 * w))
+    for y0 in range(0, h2, step):
+        y1 = min(h2, y0 + step)
+        block = img[2 * y0:2 * y1, :2 * w2].astype(np.uint16)
+        total = block[0::2, 0::2] + block[1::2, 0::2] + block[0::2, 1::2] + block[1::2, 1::2]
+        out[y0:y1] = (total + 2) // 4
+    return out
+
+
+def build_pyramid(img, size=PREVIEW_SIZE):
+    # Уровень 0 — само изображение; уменьшаем вдвое, пока уровень вдвое больше экрана.
+    # Последний уровень — превью: от 1 до 2 размеров экрана.
+    levels = [img]
+    while True:
+        h, w = levels[-1].shape[:2]
+        if max(h / size[1], w / size[0]) < 2 or min(h, w) < 2:
+            return levels
+        level = downsample2(levels[-1])
+        # Уровни только читаются, поэтому их статистика может кэшироваться
+        level.flags.writeable = False
+        levels.append(level)
+
+
+FullStats = namedtuple("FullStats", "stats v_hist")
+
+
+def source_stats(src, progress=None):
+    # Один проход по полному изображению: гистограммы каналов и гистограмма V
+    h, w = src.shape[:2]
+    strips = list(_strips(h, w))
+    hist = 0
+    v_hist = 0
+    for i, (y0, y1) in enumerate(strips):
+        strip = src[y0:y1]
+        hist = hist + channel_histograms(strip)
+        if strip.ndim == 3:
+            v_hist = v_hist + channel_histograms(hsv_value_u8(strip))[0]
+        if progress:
+            progress(i + 1, len(strips))
+    return FullStats(stats_from_hist(hist), v_hist if src.ndim == 3 else None)
+
+
+def preview_params(op, params, scale, full=None):
+    # Параметры операции для уровня пирамиды, уменьшенного в scale раз:
+    # радиус медианы масштабируется, а гистограммные операции получают
+    # статистику полного изображения, чтобы превью совпадало с итогом
+    params = dict(params)
+    if op == "median":
+        params["k"] = 2 * int(round((params.get("k", 5) // 2) / scale)) + 1
+    elif op == "adaptive_median":
+        params["max_k"] = max(3, 2 * int(round((params.get("max_k", 7) // 2) / scale)) + 1)
+    elif full is not None:
+        if op == "contrast":
+            params["lo"] = int(full.stats.min.min())
+            params["hi"] = int(full.stats.max.max())
+        elif op == "equalize_rgb":
+            params["hist"] = full.stats.hist
+        elif op == "equalize_hsv" and full.v_hist is not None:
+            params["v_hist"] = full.v_hist
+    return params
+
+
+def stream_point_ops(src, dst_path, steps, strip_pixels=STREAM_STRIP_PIXELS, progress=None):
+    # Цепочка точечных операций: проход гистограмм (если нужен) и один
+    # проход по таблице, свёрнутой из всех шагов
+    if isinstance(src, str):
+        src = np.load(src, mmap_mode="r")
+    h, w = src.shape[:2]
+    strips = list(_strips(h, w, strip_pixels))
+    dst = np.lib.format.open_memmap(dst_path, mode="w+", dtype=np.uint8, shape=src.shape)
+    channels = src.shape[2] if src.ndim == 3 else 1
+    passes = 1 if all(op == "gamma" for op, _ in steps) else 2
+    done = 0
+    hist = np.zeros((channels, 256), dtype=np.int64)
+    if passes == 2:
+        for y0, y1 in strips:
+            hist += channel_histograms(src[y0:y1])
+            done += 1
+            if progress:
+                progress(done, passes * len(strips))
+    lut = point_chain_lut(hist, steps)
+    for y0, y1 in strips:
+        apply_lut(np.asarray(src[y0:y1]), lut, out=dst[y0:y1])
+        done += 1
+        if progress:
+            progress(done, passes * len(strips))
+    dst.flush()
+    return dst
+
+
+def stream_process(src, dst_path, op, strip_pixels=STREAM_STRIP_PIXELS, k=5, progress=None, **params):
+    if op not in STREAM_OPS:
+        raise ValueError(f"Неизвестная операция: {op}")
+    if op in POINT_OPS:
+        return stream_point_ops(src, dst_path, [(op, params)], strip_pixels, progress)
+    if isinstance(src, str):
+        src = np.load(src, mmap_mode="r")
+    h, w = src.shape[:2]
+    strips = list(_strips(h, w, strip_pixels))
+    dst = np.lib.format.open_memmap(dst_path, mode="w+", dtype=np.uint8, shape=src.shape)
+    passes = 1 if op == "median" else 2
+    done = [0]
+
+    def each_strip():
+        # Прогресс по полосам; проход статистики считается отдельным проходом
+        for y0, y1 in strips:
+            yield y0, y1
+            done[0] += 1
+            if progress:
+                progress(done[0], passes * len(strips))
+
+    if op == "equalize_hsv":
+        hist = sum(channel_histograms(hsv_value_u8(src[y0:y1]))[0] for y0, y1 in each_strip())
+        lut = _hsv_lut(hist)
+        for y0, y1 in each_strip():
+            _equalize_hsv_apply(src[y0:y1], lut, out=dst[y0:y1])
+
+    elif op == "median":
+        if k % 2 == 0:
+            k += 1
+        pad = k // 2
+        for y0, y1 in each_strip():
+            # Полоса с запасом по pad строк, на краях — повтор крайней строки ('edge')
+            rows = np.clip(np.arange(y0 - pad, y1 + pad), 0, h - 1)
+            block = src[rows]
+            col_pad = ((0, 0), (pad, pad), (0, 0)) if src.ndim == 3 else ((0, 0), (pad, pad))
+            padded = np.pad(block, col_pad, mode='edge')
+            kernel = _median_hist if k >= MEDIAN_HIST_MIN_K else _median_window
+            kernel(padded, k, dst[y0:y1])
+
+    dst.flush()
+    return dst
+
+
+# ========== Цепочки операций и кэш результатов ==========
+# Pipeline — ленивое описание «источник -> операция -> операция ...».
+# Ключ каждого шага строится из ключа предыдущего и (операция, параметры),
+# а ключ источника — хэш его содержимого, поэтому одинаковые цепочки над
+# одинаковыми данными находят уже посчитанный результат в ResultCache.
+class ResultCache:
+    def __init__(self, max_bytes=RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()  # кэш читают и окно, и рабочий поток
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if value.nbytes > self.max_bytes:
+            return
+        # Закэшированный массив общий для всех, кто его получит
+        value.flags.writeable = False
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = value
+            self.nbytes += value.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self.entries.popitem(last=False)
+                self.nbytes -= old.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self.entries), "bytes": self.nbytes}
+
+
+result_cache = ResultCache()
+
+
+def image_digest(img):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((img.shape, img.dtype.str)).encode())
+    h.update(np.ascontiguousarray(img).data)
+    return h.hexdigest()
+
+
+def _file_of(src):
+    # Файл, из которого читается src (путь или memmap), или None
+    path = src if isinstance(src, str) else getattr(src, "filename", None)
+    return os.path.realpath(path) if path else None
+
+
+class Pipeline:
+    def __init__(self, source, steps=(), cache=None, _key=None):
+        self.source = source
+        self.steps = tuple(steps)
+        self.cache = result_cache if cache is None else cache
+        # Хэш источника считается один раз на все цепочки от него
+        self._key = _key if _key is not None else [None]
+
+    def then(self, op, **params):
+        if op not in OPERATIONS:
+            raise ValueError(f"Неизвестная операция: {op}")
+        step = (op, tuple(sorted(params.items())))
+        return Pipeline(self.source, self.steps + (step,), self.cache, self._key)
+
+    def keys(self):
+        if self._key[0] is None:
+            self._key[0] = image_digest(self.source)
+        keys = [self._key[0]]
+        for op, params in self.steps:
+            # Массивы в параметрах (готовые гистограммы) хэшируются по содержимому
+            text = ",".join(f"{name}={image_digest(v) if isinstance(v, np.ndarray) else repr(v)}"
+                            for name, v in params)
+            keys.append(hashlib.blake2b(f"{keys[-1]}|{op}|{text}".encode(), digest_size=16).hexdigest())
+        return keys
+
+    def evaluate(self, progress=None):
+        # Начинаем с самого длинного уже посчитанного префикса цепочки
+        keys = self.keys()
+        start, img = 0, self.source
+        for i in range(len(self.steps), 0, -1):
+            cached = self.cache.get(keys[i])
+            if cached is not None:
+                start, img = i, cached
+                break
+        n = len(self.steps)
+        i = start
+        while i < n:
+            j = self._point_run(i)
+            if j > i + 1 and img.dtype == np.uint8:
+                # Несколько точечных операций подряд — одна свёрнутая таблица
+                img = apply_point_ops(img, [(op, dict(params)) for op, params in self.steps[i:j]])
+            else:
+                j = i + 1
+                op, params = self.steps[i]
+                part = progress and (lambda done, total, i=i: progress(i + done / max(total, 1), n))
+                img = apply_operation(img, op, part, **dict(params))
+            self.cache.put(keys[j], img)
+            if progress:
+                progress(j, n)
+            i = j
+        return img
+
+    def _point_run(self, i):
+        # Конец серии точечных операций, начинающейся с шага i
+        j = i
+        while j < len(self.steps) and self.steps[j][0] in POINT_OPS:
+            j += 1
+        return j
+
+    def streamable(self):
+        return bool(self.steps) and all(op in STREAM_OPS for op, _ in self.steps)
+
+    def stream(self, src, dst_path, work_dir, progress=None):
+        # Та же цепочка в полном разрешении: каждый шаг — stream_process через .npy,
+        # серия точечных операций — один проход stream_point_ops
+        n = len(self.steps)
+        i = 0
+        source_path = _file_of(src)
+        while i < n:
+            j = max(i + 1, self._point_run(i))
+            out = dst_path if j == n else os.path.join(work_dir, f"step_{i}.npy")
+            # open_memmap("w+") обрезает файл сразу — если это файл, который
+            # сейчас читается (сохранение поверх исходного .npy), пишем во
+            # временный и подменяем им цель, когда проход закончен
+            target = None
+            if os.path.realpath(out) in (source_path, _file_of(src)):
+                target = out
+                fd, out = tempfile.mkstemp(suffix=".npy", prefix="step_", dir=work_dir)
+                os.close(fd)
+            part = progress and (lambda done, total, i=i, j=j: progress(i + (j - i) * done / max(total, 1), n))
+            try:
+                if self.steps[i][0] in POINT_OPS:
+                    steps = [(op, dict(params)) for op, params in self.steps[i:j]]
+                    src = stream_point_ops(src, out, steps, progress=part)
+                else:
+                    op, params = self.steps[i]
+                    src = stream_process(src, out, op, progress=part, **dict(params))
+            except BaseException:
+                if target is not None:
+                    os.remove(out)
+                raise
+            if target is not None:
+                del src
+                os.replace(out, target)
+                src = np.load(target, mmap_mode="r")
+            i = j
+        return src
+
+
+GLOBAL_OPS = ("contrast", "equalize_rgb", "equalize_hsv")
+
+
+def prefix_stats(source, prefix, full, work_dir, v_hist=False, progress=None):
+    # Статистика полного изображения после шагов prefix — вход следующей
+    # гистограммной операции. Серия точечных операций пересчитывает
+    # гистограммы каналов по таблице (если не нужна гистограмма V); иначе
+    # префикс один раз проходит полосами во временный .npy.
+    # None — префикс полосами не считается.
+    if not prefix:
+        return full
+    pipeline = Pipeline(source)
+    for op, params in prefix:
+        pipeline = pipeline.then(op, **params)
+    if all(op in POINT_OPS for op, _ in prefix) and not v_hist:
+        hist = full.stats.hist
+        return FullStats(stats_from_hist(lut_hist(hist, point_chain_lut(hist, prefix))), None)
+    if not pipeline.streamable():
+        return None
+    fd, dst = tempfile.mkstemp(suffix=".npy", prefix="prefix_", dir=work_dir)
+    os.close(fd)
+    try:
+        part = progress and (lambda done, total: progress(done, 2 * total))
+        result = pipeline.stream(source, dst, work_dir, part)
+        return source_stats(result, progress and (lambda done, total: progress(total + done, 2 * total)))
+    finally:
+        os.remove(dst)
+
+
+class BackgroundJob:
+    # Счётчики пишет рабочий поток, читает окно; отмена — через флаг,
+    # который проверяется при каждом отчёте о прогрессе
+    def __init__(self, title):
+        self.title = title
+        self.cancel_event = threading.Event()
+        self.done = 0
+        self.total = 1
+
+    def report(self, done, total):
+        if self.cancel_event.is_set():
+            raise CancelledError()
+        self.done, self.total = done, total
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+def _import_gui():
+    global tk, filedialog, messagebox, ttk, ImageTk, Figure, FigureCanvasTkAgg
+    if tk is not None:
+        return
+    import tkinter
+    from tkinter import filedialog as fd, messagebox as mb, ttk as themed
+    from PIL import ImageTk as image_tk
+    from matplotlib.figure import Figure as figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas
+    tk, filedialog, messagebox, ttk = tkinter, fd, mb, themed
+    ImageTk, Figure, FigureCanvasTkAgg = image_tk, figure, canvas
 
 
 class ImageProcessorApp:
     def __init__(self, root):
+        _import_gui()
         self.root = root
         self.root.title("Обработка изображений")
         self.root.geometry("1100x820")
 
         self.original = None
         self.processed = None
+        self.source = None    # полное разрешение (memmap)
+        self.source_tmp = None  # .npy источника в work_dir, если его создали мы
+        self.pyramid = None   # уровни от source до original — уровня под размер экрана
+        self.full = None      # статистика полного изображения (FullStats)
+        self.scale = 1.0      # во сколько раз original меньше source
+        self.steps = []       # операции цепочки с параметрами для полного разрешения
+        self.step_stats = []  # статистика полного изображения на входе каждого шага (или None)
+        self.base = None      # Pipeline от original без операций
+        self.pipeline = None  # цепочка превью, результат которой сейчас на экране
+        self.work_dir = tempfile.mkdtemp(prefix="lab2_")
+        # Один рабочий поток: новая задача отменяет текущую и встаёт следом
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.job = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         btn_frame = tk.Frame(root)
         btn_frame.pack(pady=8)
@@ -121,81 +996,292 @@ class ImageProcessorApp:
         tk.Button(btn_frame, text="Эквализация RGB", command=self.apply_eq_rgb).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Эквализация HSV", command=self.apply_eq_hsv).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Медианный фильтр", command=self.apply_median).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Адаптивный медианный", command=self.apply_adaptive_median).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Гистограмма", command=self.show_hist).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Фрагмент 1:1", command=self.zoom_full).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Сохранить (полное разрешение)", command=self.export_full).pack(side=tk.LEFT, padx=5)
+        self.chain_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(btn_frame, text="К результату", variable=self.chain_var).pack(side=tk.LEFT, padx=5)
+
+        status_frame = tk.Frame(root)
+        status_frame.pack(fill=tk.X, padx=10)
+        self.status_label = tk.Label(status_frame, text="", width=40, anchor="w")
+        self.status_label.pack(side=tk.LEFT)
+        self.progress = ttk.Progressbar(status_frame, length=300, maximum=100)
+        self.progress.pack(side=tk.LEFT, padx=5)
+        tk.Button(status_frame, text="Отмена", command=self.cancel_job).pack(side=tk.LEFT, padx=5)
 
         self.image_label = tk.Label(root)
         self.image_label.pack(pady=10)
 
         self.hist_frame = tk.Frame(root)
         self.hist_frame.pack(pady=10)
+        # Одна фигура гистограммы на всё время работы окна (создаётся при первом показе)
+        self.hist_canvas = None
+        self.hist_lines = []
+        self.hist_bg = None
+
+    # ========== Фоновые задачи ==========
+    def run_job(self, title, func, on_done):
+        # func(progress) выполняется в рабочем потоке, on_done(result) — в потоке окна
+        if self.job is not None:
+            self.job.cancel()
+        job = BackgroundJob(title)
+        self.job = job
+        future = self.executor.submit(func, job.report)
+        self.status_label.config(text=title)
+        self.progress["value"] = 0
+        self.root.after(POLL_MS, self.poll_job, job, future, on_done)
+
+    def poll_job(self, job, future, on_done):
+        if job is not self.job:
+            return  # задачу заменили более новой, её результат не нужен
+        if not future.done():
+            self.progress["value"] = 100 * job.done / max(job.total, 1)
+            self.root.after(POLL_MS, self.poll_job, job, future, on_done)
+            return
+        self.job = None
+        self.progress["value"] = 0
+        try:
+            result = future.result()
+        except CancelledError:
+            self.status_label.config(text=f"{job.title}: отменено")
+            return
+        except Exception as e:
+            self.status_label.config(text="")
+            messagebox.showerror("Ошибка", str(e))
+            return
+        self.status_label.config(text="")
+        on_done(result)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def on_close(self):
+        self.cancel_job()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
 
     def load_image(self):
-        path = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg *.bmp")])
+        path = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg *.bmp *.tif *.tiff *.npy")])
         if not path:
             return
-        pil_img = Image.open(path).convert("RGB")
-        pil_img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-        self.original = np.array(pil_img)
-        self.processed = self.original.copy()
-        self._show_image(self.processed)
+
+        def load(progress):
+            source = open_image_buffer(path, self.work_dir)
+            tmp = source.filename if os.path.dirname(source.filename) == self.work_dir else None
+            try:
+                return source, tmp, build_pyramid(source), source_stats(source, progress)
+            except BaseException:
+                if tmp:
+                    del source
+                    os.remove(tmp)
+                raise
+
+        def loaded(result):
+            old_tmp = self.source_tmp
+            self.source, self.source_tmp, self.pyramid, self.full = result
+            if old_tmp:
+                # Старое отображение может ещё жить в кэше или фоновой задаче — на POSIX
+                # удалённый файл остаётся доступен до закрытия; если удалить нельзя,
+                # файл уберёт on_close вместе с work_dir
+                try:
+                    os.remove(old_tmp)
+                except OSError:
+                    pass
+            self.original = self.pyramid[-1]
+            self.scale = self.source.shape[1] / self.original.shape[1]
+            self.processed = self.original
+            self.steps = []
+            self.step_stats = []
+            self.base = Pipeline(self.original)
+            self.pipeline = self.base
+            self._show_image(self.processed)
+            self.refresh_hist()
+
+        self.run_job("Загрузка", load, loaded)
 
     def _show_image(self, arr):
+        # Уровень превью бывает до двух раз больше окна — подгоняем только для показа
         pil_img = Image.fromarray(arr)
+        pil_img.thumbnail(PREVIEW_SIZE, Image.Resampling.LANCZOS)
         tk_img = ImageTk.PhotoImage(pil_img)
         self.image_label.config(image=tk_img)
         self.image_label.image = tk_img
 
-    def apply_contrast(self):
+    def start_operation(self, title, op, **params):
         if self.original is None:
             messagebox.showwarning("Ошибка", "Загрузите изображение")
             return
-        self.processed = linear_contrast(self.original)
-        self._show_image(self.processed)
+        # «К результату» — продолжаем текущую цепочку, иначе начинаем от исходного
+        chained = self.chain_var.get()
+        prefix = list(self.steps) if chained else []
+        stats = list(self.step_stats) if chained else []
+        steps = prefix + [(op, params)]
+        if op in GLOBAL_OPS and any(step_op not in STREAM_OPS for step_op, _ in prefix):
+            # Без статистики полного изображения превью и 1:1 разошлись бы с итогом
+            messagebox.showwarning("Ошибка", "После адаптивного медианного фильтра контраст и эквализация "
+                                             "недоступны: статистику полного изображения не посчитать")
+            return
+        source, full, base, scale, work_dir = self.source, self.full, self.base, self.scale, self.work_dir
+
+        def run(progress):
+            # Гистограммной операции в конце цепочки нужна статистика полного
+            # изображения после предыдущих шагов — считаем её один раз на шаг
+            own = None
+            if op in GLOBAL_OPS or not prefix:
+                own = prefix_stats(source, prefix, full, work_dir, op == "equalize_hsv", progress)
+            step_stats = stats + [own]
+            pipeline = base
+            for (step_op, step_params), step_full in zip(steps, step_stats):
+                pipeline = pipeline.then(step_op, **preview_params(step_op, step_params, scale, step_full))
+            return pipeline.evaluate(progress), pipeline, step_stats
+
+        def done(result):
+            result, pipeline, step_stats = result
+            self.processed = result
+            self.steps = steps
+            self.step_stats = step_stats
+            self.pipeline = pipeline
+            self._show_image(self.processed)
+            self.refresh_hist()
+            stats = result_cache.stats()
+            self.status_label.config(text=f"Кэш: попаданий {stats['hits']}, промахов {stats['misses']}, "
+                                          f"{stats['bytes'] / 2**20:.0f} МБ")
+
+        self.run_job(title, run, done)
+
+    def apply_contrast(self):
+        self.start_operation("Линейное контрастирование", "contrast")
 
     def apply_eq_rgb(self):
-        if self.original is None:
-            messagebox.showwarning("Ошибка", "Загрузите изображение")
-            return
-        self.processed = equalize_rgb(self.original)
-        self._show_image(self.processed)
+        self.start_operation("Эквализация RGB", "equalize_rgb")
 
     def apply_eq_hsv(self):
-        if self.original is None:
-            messagebox.showwarning("Ошибка", "Загрузите изображение")
-            return
-        self.processed = equalize_hsv(self.original)
-        self._show_image(self.processed)
+        self.start_operation("Эквализация HSV", "equalize_hsv")
 
     def apply_median(self):
-        if self.original is None:
-            messagebox.showwarning("Ошибка", "Загрузите изображение")
+        self.start_operation("Медианный фильтр", "median", k=5)
+
+    def apply_adaptive_median(self):
+        self.start_operation("Адаптивный медианный фильтр", "adaptive_median", max_k=7)
+
+    def full_pipeline(self):
+        pipeline = Pipeline(self.source)
+        for op, params in self.steps:
+            pipeline = pipeline.then(op, **params)
+        return pipeline
+
+    def zoom_full(self):
+        # Центральный фрагмент в полном разрешении: та же цепочка с исходными
+        # радиусами и с запасом по краям на окна медианных фильтров
+        if self.source is None or not self.steps:
+            messagebox.showwarning("Ошибка", "Сначала примените операцию")
+            return
+        source, steps, step_stats = self.source, list(self.steps), list(self.step_stats)
+
+        def zoom(progress):
+            h, w = source.shape[:2]
+            ch, cw = min(h, PREVIEW_SIZE[1]), min(w, PREVIEW_SIZE[0])
+            y0, x0 = (h - ch) // 2, (w - cw) // 2
+            halo = sum(params.get("k", 5) // 2 if op == "median" else
+                       params.get("max_k", 7) // 2 if op == "adaptive_median" else 0
+                       for op, params in steps)
+            ya, xa = max(0, y0 - halo), max(0, x0 - halo)
+            img = np.asarray(source[ya:min(h, y0 + ch + halo), xa:min(w, x0 + cw + halo)])
+            for i, (op, params) in enumerate(steps):
+                part = lambda done, total, i=i: progress(i + done / max(total, 1), len(steps))
+                img = apply_operation(img, op, part, **preview_params(op, params, 1.0, step_stats[i]))
+            return img[y0 - ya:y0 - ya + ch, x0 - xa:x0 - xa + cw]
+
+        self.run_job("Фрагмент 1:1", zoom, self._show_image)
+
+    def export_full(self):
+        pipeline = self.full_pipeline() if self.source is not None else None
+        if pipeline is None or not pipeline.streamable():
+            # Адаптивный фильтр полосами не считается, такие цепочки не сохраняем
+            messagebox.showwarning("Ошибка", "Сначала примените контраст, эквализацию или медианный фильтр")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[
+            ("PNG", "*.png"), ("JPEG", "*.jpg"), ("TIFF", "*.tif"), ("NumPy", "*.npy")])
+        if not path:
             return
-        self.processed = median_filter_rgb(self.original, k=5)
-        self._show_image(self.processed)
+        source = self.source
+        # Считаем по полосам в .npy; в обычный формат PIL кодирует уже готовый результат
+        dst = path if path.lower().endswith(".npy") else os.path.join(self.work_dir, "export.npy")
+
+        def export(progress):
+            result = pipeline.stream(source, dst, self.work_dir, progress)
+            if dst != path:
+                Image.fromarray(np.asarray(result)).save(path)
+            return path
+
+        self.run_job("Сохранение в полном разрешении", export,
+                     lambda saved: messagebox.showinfo("Готово", f"Сохранено: {saved}"))
 
     def show_hist(self):
         if self.processed is None:
             messagebox.showwarning("Ошибка", "Нет изображения")
             return
-        for w in self.hist_frame.winfo_children():
-            w.destroy()
-        fig, ax = plt.subplots(figsize=(5, 2))
-        if self.processed.ndim == 3:
-            for i, col in enumerate(['r', 'g', 'b']):
-                hist, _ = np.histogram(self.processed[:, :, i], bins=256, range=(0, 256))
-                ax.plot(hist, color=col)
-        else:
-            hist, _ = np.histogram(self.processed, bins=256, range=(0, 256))
-            ax.plot(hist, color='k')
+        if self.hist_canvas is None:
+            self.create_hist_figure()
+        self.update_hist()
+
+    def create_hist_figure(self):
+        # Figure без pyplot: фигура не попадает в глобальный список и живёт вместе с окном.
+        # Линии animated — обычная отрисовка рисует только оси, а линии
+        # накладываются поверх сохранённого фона (blit)
+        fig = Figure(figsize=(5, 2))
+        ax = fig.add_subplot()
+        x = np.arange(256)
+        self.hist_lines = [ax.plot(x, np.zeros(256), color=col, animated=True)[0] for col in "rgb"]
+        ax.set_xlim(0, 255)
         ax.set_title("Гистограмма")
         ax.set_xlabel("Яркость")
         ax.set_ylabel("Частота")
-        canvas = FigureCanvasTkAgg(fig, self.hist_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+        fig.tight_layout()
+        self.hist_ax = ax
+        self.hist_canvas = FigureCanvasTkAgg(fig, self.hist_frame)
+        self.hist_canvas.mpl_connect("draw_event", self.on_hist_draw)
+        self.hist_canvas.get_tk_widget().pack()
+
+    def on_hist_draw(self, event):
+        # После полной перерисовки (смена масштаба, изменение окна) запоминаем фон
+        self.hist_bg = self.hist_canvas.copy_from_bbox(self.hist_ax.bbox)
+        self.blit_hist()
+
+    def blit_hist(self):
+        self.hist_canvas.restore_region(self.hist_bg)
+        for line in self.hist_lines:
+            self.hist_ax.draw_artist(line)
+        self.hist_canvas.blit(self.hist_ax.bbox)
+
+    def update_hist(self):
+        hist = image_stats(self.processed).hist
+        colors = "rgb" if len(hist) == 3 else "k"
+        for i, line in enumerate(self.hist_lines):
+            line.set_visible(i < len(hist))
+            if i < len(hist):
+                line.set_ydata(hist[i])
+                line.set_color(colors[i])
+        # Ось Y перестраивается, только если пик вышел за шкалу или стал намного меньше
+        top = max(1, int(hist.max()))
+        ymax = self.hist_ax.get_ylim()[1]
+        if self.hist_bg is None or top > ymax or top < ymax / 2:
+            self.hist_ax.set_ylim(0, top * 1.05)
+            self.hist_canvas.draw()
+        else:
+            self.blit_hist()
 
+    def refresh_hist(self):
+        # Открытая гистограмма следует за результатом
+        if self.hist_canvas is not None and self.processed is not None:
+            self.update_hist()
 
 if __name__ == "__main__":
+    _import_gui()
     root = tk.Tk()
     app = ImageProcessorApp(root)
     root.mainloop()
\ No newline at end of file
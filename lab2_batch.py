@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+from PIL import Image
+
+from lab2 import OPERATIONS, apply_operation
+
+# Пакетная обработка каталога: одна и та же цепочка операций lab2 для всех файлов.
+#   python lab2_batch.py frames/ out/ --op median k=5 --op equalize_hsv
+# Файлы раздаются процессам пачками; внутри процесса чтение следующего файла
+# и запись предыдущего идут в отдельных потоках параллельно с вычислениями
+# (PIL и numpy отпускают GIL). Уже готовые выходы с тем же рецептом пропускаются.
+
+EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+RECIPE_FILE = ".lab2_batch.json"
+CHUNK = 4  # файлов в одной задаче процесса
+
+
+def parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_steps(specs):
+    # ["median", "k=5"] -> ("median", {"k": 5})
+    steps = []
+    for spec in specs:
+        op, params = spec[0], {}
+        if op not in OPERATIONS:
+            raise ValueError(f"Неизвестная операция: {op} (есть: {', '.join(OPERATIONS)})")
+        for item in spec[1:]:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Параметр должен быть вида имя=значение: {item}")
+            params[name] = parse_value(value)
+        steps.append((op, params))
+    return steps
+
+
+def output_path(path, out_dir, fmt=None):
+    name = os.path.basename(path)
+    if fmt:
+        name = os.path.splitext(name)[0] + "." + fmt
+    return os.path.join(out_dir, name)
+
+
+def up_to_date(src, dst):
+    return os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+
+
+def decode(path):
+    with Image.open(path) as pil_img:
+        return np.asarray(pil_img.convert("RGB"))
+
+
+def encode(img, path):
+    # Сначала во временный файл: прерванный запуск не оставит «готовый» битый выход
+    tmp = path + ".part"
+    Image.fromarray(img).save(tmp, format=Image.registered_extensions()[os.path.splitext(path)[1].lower()])
+    os.replace(tmp, path)
+
+
+def process_chunk(jobs, steps):
+    # jobs — пары (вход, выход); возвращает (вход, пикселей, ошибка) для каждого
+    results = []
+    with ThreadPoolExecutor(1) as reader, ThreadPoolExecutor(1) as writer:
+        pending = [reader.submit(decode, src) for src, _ in jobs[:1]]
+        writes = []
+        for i, (src, dst) in enumerate(jobs):
+            if i + 1 < len(jobs):
+                pending.append(reader.submit(decode, jobs[i + 1][0]))
+            try:
+                img = pending[i].result()
+                for op, params in steps:
+                    img = apply_operation(img, op, **params)
+                writes.append((src, img.shape[0] * img.shape[1], writer.submit(encode, img, dst)))
+            except Exception as e:
+                results.append((src, 0, f"{type(e).__name__}: {e}"))
+        for src, pixels, future in writes:
+            try:
+                future.result()
+                results.append((src, pixels, None))
+            except Exception as e:
+                results.append((src, 0, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def collect(in_dir, out_dir, steps, fmt=None, force=False):
+    # Рецепт (цепочка и формат) лежит рядом с выходами; если он поменялся,
+    # старые файлы не считаются готовыми
+    recipe = {"steps": steps, "format": fmt}
+    recipe_path = os.path.join(out_dir, RECIPE_FILE)
+    try:
+        with open(recipe_path) as f:
+            same = json.load(f) == json.loads(json.dumps(recipe))
+    except (OSError, ValueError):
+        same = False
+    pairs, sources = [], {}
+    for name in sorted(os.listdir(in_dir)):
+        src = os.path.join(in_dir, name)
+        if not name.lower().endswith(EXTENSIONS) or not os.path.isfile(src):
+            continue
+        dst = output_path(src, out_dir, fmt)
+        sources.setdefault(os.path.normcase(dst), []).append(name)
+        pairs.append((src, dst))
+    # С --format файлы, различающиеся только расширением (a.jpg и a.png), дали бы
+    # один выход, и процессы переписывали бы его друг за другом
+    clashes = [names for names in sources.values() if len(names) > 1]
+    if clashes:
+        raise ValueError("Несколько входов дают один выходной файл: "
+                         + "; ".join(", ".join(names) for names in clashes))
+    jobs, skipped = [], 0
+    for src, dst in pairs:
+        if same and not force and up_to_date(src, dst):
+            skipped += 1
+        else:
+            jobs.append((src, dst))
+    return jobs, skipped, recipe, recipe_path
+
+
+def run(in_dir, out_dir, steps, workers=None, fmt=None, force=False, chunk=CHUNK):
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        jobs, skipped, recipe, recipe_path = collect(in_dir, out_dir, steps, fmt, force)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if not jobs:
+        print(f"Нечего делать: все {skipped} файлов актуальны")
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [jobs[i:i + chunk] for i in range(0, len(jobs), chunk)]
+    done = pixels = 0
+    failed = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        # В полёте не больше двух пачек на процесс: память ограничена, а процессы не простаивают
+        queue = iter(chunks)
+        running = set()
+        while True:
+            while len(running) < 2 * workers:
+                part = next(queue, None)
+                if part is None:
+                    break
+                running.add(pool.submit(process_chunk, part, steps))
+            if not running:
+                break
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for src, n, error in future.result():
+                    if error:
+                        failed.append((src, error))
+                    else:
+                        done += 1
+                        pixels += n
+            elapsed = time.perf_counter() - start
+            print(f"\r{done + len(failed)}/{len(jobs)}  {done / elapsed:.1f} изобр./с"
+                  f"  {pixels / 1e6 / elapsed:.1f} Мп/с", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    # Рецепт записывается только после полного прохода: если запуск прервали
+    # после смены цепочки, следующий снова пересчитает всё
+    with open(recipe_path, "w") as f:
+        json.dump(recipe, f)
+    print()
+    print(f"Готово: {done}, пропущено (актуальны): {skipped}, ошибок: {len(failed)}")
+    print(f"Время {elapsed:.2f} с: {done / elapsed:.2f} изобр./с, {pixels / 1e6 / elapsed:.2f} Мп/с"
+          f" ({workers} процессов)")
+    for src, error in failed:
+        print(f"  {src}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пакетная обработка каталога операциями lab2")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--op", action="append", nargs="+", required=True, metavar="OP",
+                        help=f"операция и параметры имя=значение, по порядку; операции: {', '.join(OPERATIONS)}")
+    parser.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию — число ядер)")
+    parser.add_argument("--format", default=None, help="расширение выходных файлов, например png")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="файлов в одной задаче процесса")
+    parser.add_argument("--force", action="store_true", help="пересчитать даже актуальные выходы")
+    args = parser.parse_args()
+    try:
+        steps = parse_steps(args.op)
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(run(args.input_dir, args.output_dir, steps, args.workers, args.format, args.force, args.chunk))
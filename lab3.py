@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import math
 import time
+import numpy as np
 
 
 GRID_MIN = -30
@@ -9,6 +11,331 @@ GRID_SIZE = GRID_MAX - GRID_MIN + 1
 PIXEL_SCALE = 12
 CANVAS_SIZE = GRID_SIZE * PIXEL_SCALE
 
+# Растр — индексы цветов по клеткам; на холст он выводится картинкой под линиями сетки
+COLOR_INDEX = {"red": 1, "blue": 2}
+PALETTE = np.array([[255, 255, 255], [255, 0, 0], [0, 0, 255]], dtype=np.uint8)
+
+# Вид: масштаб — пикселей на клетку (дроби — несколько клеток в пикселе),
+# GRID_MIN..GRID_MAX — только начальная область просмотра
+ZOOM_LEVELS = (1 / 256, 1 / 128, 1 / 64, 1 / 32, 1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+NICE_STEPS = tuple(m * 10 ** e for e in range(10) for m in (1, 5))
+GRID_MIN_PX = 6     # линии сетки не чаще, чем через столько пикселей, иначе прореживаются
+LABEL_MIN_PX = 50   # то же для подписей
+
+
+def framebuffer_to_ppm(fb, scale=PIXEL_SCALE, width=None, height=None):
+    # Каждая клетка — квадрат scale x scale; двоичный PPM tk.PhotoImage читает сам
+    rgb = PALETTE[fb].repeat(scale, axis=0).repeat(scale, axis=1)[:height, :width]
+    h, w = rgb.shape[:2]
+    return b"P6 %d %d 255\n" % (w, h) + np.ascontiguousarray(rgb).tobytes()
+
+
+# ========== Растр на неограниченной плоскости ==========
+# Клетки лежат плитками TILE x TILE, плитка создаётся при первой записи.
+# Строка растра — это -y, столбец — x. Изменённые плитки собираются в dirty,
+# и окно перерисовывает только их; для мелких масштабов плитки уменьшаются
+# (максимум по блоку, чтобы тонкие линии не пропадали) и это кэшируется.
+# Часть отрезка, покрывающая плитки целиком (заливка), плиток не заводит:
+# она хранится одной записью (строка, первая и последняя плитка, цвет),
+# так что память и время на строку не зависят от её длины. С плитками
+# такие записи сводятся по максимуму — как и при уменьшении.
+TILE = 256
+COORD_LIMIT = 1 << 14  # предел координат и радиусов: растр всё же не бесконечен
+
+
+class TileRaster:
+    def __init__(self):
+        self.tiles = {}
+        self.reduced = {}  # (ключ плитки, шаг) -> уменьшенная плитка
+        self.runs = []     # (строка, первая плитка, последняя плитка, цвет)
+        self.run_array = None  # runs массивом для sample, строится по требованию
+        self.dirty = set()
+
+    def _tile(self, key):
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = np.zeros((TILE, TILE), dtype=np.uint8)
+        self.dirty.add(key)
+        return tile
+
+    def set(self, row, col, value):
+        self._tile((row // TILE, col // TILE))[row % TILE, col % TILE] = value
+
+    def set_span(self, row, col0, col1, value):
+        # В плитки пишутся только неполные края отрезка, целые плитки — одной записью
+        tr, r = divmod(row, TILE)
+        t0, t1 = col0 // TILE, col1 // TILE
+        a = t0 if col0 % TILE == 0 else t0 + 1
+        b = t1 if col1 % TILE == TILE - 1 else t1 - 1
+        if a <= b:
+            self.runs.append((row, a, b, value))
+            self.run_array = None
+            # Для перерисовки важна только рамка изменений — хватит крайних плиток
+            self.dirty.update(((tr, a), (tr, b)))
+        for tc in {t0, t1}:
+            if a <= tc <= b:
+                continue
+            self._tile((tr, tc))[r, col0 - tc * TILE if tc == t0 else 0:col1 - tc * TILE + 1 if tc == t1 else TILE] = value
+
+    def clear(self):
+        self.dirty.update(self.tiles)
+        self.dirty.update((row // TILE, tc) for row, a, b, _ in self.runs for tc in (a, b))
+        self.tiles = {}
+        self.reduced = {}
+        self.runs = []
+        self.run_array = None
+
+    def flush(self):
+        # Забрать изменённые плитки; их уменьшенные копии устарели
+        dirty, self.dirty = self.dirty, set()
+        if self.reduced:
+            self.reduced = {k: v for k, v in self.reduced.items() if k[0] not in dirty}
+        return dirty
+
+    def _reduce(self, key, step):
+        small = self.reduced.get((key, step))
+        if small is None:
+            tile = self.tiles[key]
+            if step == 1:
+                small = tile
+            elif step <= TILE:
+                n = TILE // step
+                small = tile.reshape(n, step, n, step).max(axis=(1, 3))
+            else:
+                small = tile.max().reshape(1, 1)
+            self.reduced[(key, step)] = small
+        return small
+
+    def sample(self, row0, col0, rows, cols, step=1):
+        # Пиксели (rows, cols), каждый — блок step x step клеток начиная с (row0, col0);
+        # row0 и col0 кратны step. Обходятся только существующие плитки
+        out = np.zeros((rows, cols), dtype=np.uint8)
+        for key in self.tiles:
+            tr, tc = key
+            r0 = (tr * TILE) // step - row0 // step
+            c0 = (tc * TILE) // step - col0 // step
+            n = max(1, TILE // step)
+            ra, rb = max(r0, 0), min(r0 + n, rows)
+            ca, cb = max(c0, 0), min(c0 + n, cols)
+            if ra < rb and ca < cb:
+                small = self._reduce(key, step)
+                view = out[ra:rb, ca:cb]
+                np.maximum(view, small[ra - r0:rb - r0, ca - c0:cb - c0], out=view)
+        if self.runs:
+            self._sample_runs(out, row0, col0, step)
+        return out
+
+    def _sample_runs(self, out, row0, col0, step):
+        # Отрезки целых плиток: для каждого цвета покрытие строк собирается
+        # разностным массивом (+1 в начале, -1 после конца) и накопленной суммой
+        if self.run_array is None:
+            self.run_array = np.array(self.runs, dtype=np.int64)
+        rows, cols = out.shape
+        row, a, b, value = self.run_array.T
+        orow = (row - row0) // step
+        ca = np.maximum((a * TILE - col0) // step, 0)
+        cb = np.minimum(((b + 1) * TILE - 1 - col0) // step + 1, cols)
+        keep = (orow >= 0) & (orow < rows) & (ca < cb)
+        for v in np.unique(value[keep]):
+            sel = keep & (value == v)
+            diff = np.zeros((rows, cols + 1), dtype=np.int32)
+            np.add.at(diff, (orow[sel], ca[sel]), 1)
+            np.add.at(diff, (orow[sel], cb[sel]), -1)
+            covered = diff.cumsum(axis=1)[:, :cols] > 0
+            out[covered] = np.maximum(out[covered], v)
+
+
+# ========== Пакетная растеризация без окна ==========
+# Отрезки — массив (N, 4) [x1, y1, x2, y2], окружности — (N, 3) [cx, cy, r].
+# Результат — плоские xs, ys и offsets длины N + 1: пиксели примитива i —
+# xs[offsets[i]:offsets[i + 1]]. Координаты не обрезаются по сетке, порядок
+# и повторы пикселей те же, что у методов RasterLabApp.
+BATCH_CELLS = 1 << 20  # ячеек в одном блоке ЦДА (строки x длина самого длинного)
+
+
+def _as_primitives(arr, width):
+    arr = np.asarray(arr, dtype=np.int64).reshape(-1, width)
+    return [arr[:, i] for i in range(width)]
+
+
+def dda_lines(segments, max_cells=BATCH_CELLS):
+    # Как dda_line/step_line: x += x_inc накапливается в float64, поэтому
+    # точки — np.cumsum по строке [x1, inc, inc, ...] (сложения идут в том же
+    # порядке), а round() Python — это np.rint (к чётному). Отрезки сортируются
+    # по длине и собираются в блоки почти одинаковой длины
+    x1, y1, x2, y2 = _as_primitives(segments, 4)
+    dx, dy = x2 - x1, y2 - y1
+    length = np.maximum(np.abs(dx), np.abs(dy))
+    counts = length + 1
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    xs = np.empty(offsets[-1], dtype=np.int64)
+    ys = np.empty(offsets[-1], dtype=np.int64)
+    safe = np.maximum(length, 1)
+    x_inc, y_inc = dx / safe, dy / safe
+    order = np.argsort(counts, kind="stable")
+    sorted_counts = counts[order]
+    i, n = 0, len(order)
+    while i < n:
+        # Самый большой блок, где строки x самая длинная строка <= max_cells
+        k = np.arange(1, min(n - i, max_cells) + 1)
+        rows = max(1, int(np.searchsorted(k * sorted_counts[i:i + len(k)], max_cells, side="right")))
+        ids = order[i:i + rows]
+        width = int(sorted_counts[i + rows - 1])
+        cols = np.arange(width)
+        mask = cols < counts[ids][:, None]
+        pos = (offsets[ids][:, None] + cols)[mask]
+        for start, inc, out in ((x1, x_inc, xs), (y1, y_inc, ys)):
+            acc = np.empty((rows, width), dtype=np.float64)
+            acc[:, 0] = start[ids]
+            acc[:, 1:] = inc[ids][:, None]
+            np.cumsum(acc, axis=1, out=acc)
+            out[pos] = np.rint(acc[mask])
+        i += rows
+    return xs, ys, offsets
+
+
+def bresenham_lines(segments):
+    # Все отрезки идут одновременно: шаг t делает шаг t каждого ещё не
+    # законченного отрезка. В отрезке ровно max(|dx|, |dy|) + 1 точек, поэтому
+    # позиции известны заранее, а отрезки, отсортированные по убыванию длины,
+    # на каждом шаге образуют префикс — активные берутся срезом
+    x1, y1, x2, y2 = _as_primitives(segments, 4)
+    adx, ady = np.abs(x2 - x1), np.abs(y2 - y1)
+    counts = np.maximum(adx, ady) + 1
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    xs = np.empty(offsets[-1], dtype=np.int64)
+    ys = np.empty(offsets[-1], dtype=np.int64)
+    order = np.argsort(-counts, kind="stable")
+    n_active = np.searchsorted(-counts[order], -np.arange(int(counts.max(initial=0))), side="left")
+    dx, dy = adx[order], ady[order]
+    sx = np.where(x1 < x2, 1, -1)[order]
+    sy = np.where(y1 < y2, 1, -1)[order]
+    base = offsets[order]
+    x, y = x1[order], y1[order]
+    err = dx - dy
+    for t, m in enumerate(n_active):
+        x, y, err = x[:m], y[:m], err[:m]
+        xs[base[:m] + t] = x
+        ys[base[:m] + t] = y
+        e2 = 2 * err
+        step_x = e2 > -dy[:m]
+        step_y = e2 < dx[:m]
+        err = err - np.where(step_x, dy[:m], 0) + np.where(step_y, dx[:m], 0)
+        x = x + np.where(step_x, sx[:m], 0)
+        y = y + np.where(step_y, sy[:m], 0)
+    return xs, ys, offsets
+
+
+def bresenham_circles(circles):
+    # Как bresenham_circle_full: на каждом шаге все ещё активные окружности
+    # дают по 8 точек (plot8circle); в конце точки группируются по окружностям
+    cx, cy, r = _as_primitives(circles, 3)
+    n = len(r)
+    x = np.zeros(n, dtype=np.int64)
+    y = r.copy()
+    e = 3 - 2 * r
+    ids = np.arange(n)
+    chunks = []
+
+    def emit(ids, x, y):
+        px, py = cx[ids][:, None], cy[ids][:, None]
+        xx, yy = x[:, None], y[:, None]
+        chunks.append((np.repeat(ids, 8),
+                       np.hstack([px + xx, px - xx, px + xx, px - xx, px + yy, px - yy, px + yy, px - yy]).ravel(),
+                       np.hstack([py + yy, py + yy, py - yy, py - yy, py + xx, py + xx, py - xx, py - xx]).ravel()))
+
+    emit(ids, x, y)
+    while len(ids):
+        keep = y >= x
+        ids, x, y, e = ids[keep], x[keep] + 1, y[keep], e[keep]
+        down = e >= 0
+        y = y - down
+        e = np.where(down, e + 4 * (x - y) + 10, e + 4 * x + 6)
+        if len(ids):
+            emit(ids, x, y)
+    owner = np.concatenate([c[0] for c in chunks])
+    order = np.argsort(owner, kind="stable")
+    xs = np.concatenate([c[1] for c in chunks])[order]
+    ys = np.concatenate([c[2] for c in chunks])[order]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(owner, minlength=n))))
+    return xs, ys, offsets
+
+
+# ========== Окружность и эллипс горизонтальными отрезками ==========
+# Точки одной четверти строятся за O(r) шагов, для каждой строки запоминается
+# крайний левый и правый x контура. Из этого получаются отрезки строк
+# (y, x0, x1) включительно: контур — по два коротких отрезка на строку,
+# заливка — один от левого края до правого. В растр отрезок пишется одним
+# присваиванием среза, так что диск радиуса 10 000 — это O(r) операций.
+def _circle_quadrant(r):
+    # Та же рекуррентная формула, что в bresenham_circle_full, точки (x, y) и (y, x)
+    x, y, e = 0, r, 3 - 2 * r
+    points = [(0, r), (r, 0)]
+    while y >= x:
+        x += 1
+        if e >= 0:
+            y -= 1
+            e += 4 * (x - y) + 10
+        else:
+            e += 4 * x + 6
+        points.append((x, y))
+        points.append((y, x))
+    return points
+
+
+def _ellipse_quadrant(rx, ry):
+    # Алгоритм средней точки в целых числах (решающие величины умножены на 4)
+    rx2, ry2 = rx * rx, ry * ry
+    x, y = 0, ry
+    points = []
+    # Область 1: касательная положе 45°, шаг по x
+    d = 4 * ry2 - 4 * rx2 * ry + rx2
+    while ry2 * x < rx2 * y:
+        points.append((x, y))
+        x += 1
+        if d < 0:
+            d += 4 * ry2 * (2 * x + 1)
+        else:
+            y -= 1
+            d += 4 * ry2 * (2 * x + 1) - 8 * rx2 * y
+    # Область 2: круче 45°, шаг по y
+    d = ry2 * (2 * x + 1) ** 2 + 4 * rx2 * (y - 1) ** 2 - 4 * rx2 * ry2
+    while y >= 0:
+        points.append((x, y))
+        y -= 1
+        if d > 0:
+            d += 4 * rx2 * (1 - 2 * y)
+        else:
+            x += 1
+            d += 8 * ry2 * x + 4 * rx2 * (1 - 2 * y)
+    # У вытянутых эллипсов область 2 кончается раньше x = rx — дотягиваем строку y = 0
+    if points[-1][0] < rx:
+        points.append((rx, 0))
+    return points
+
+
+def _quadrant_spans(cx, cy, points, filled):
+    extents = {}
+    for x, y in points:
+        lo, hi = extents.get(y, (x, x))
+        extents[y] = (min(lo, x), max(hi, x))
+    for dy, (lo, hi) in extents.items():
+        for gy in {cy + dy, cy - dy}:
+            if filled or lo <= 0:
+                yield gy, cx - hi, cx + hi
+            else:
+                yield gy, cx - hi, cx - lo
+                yield gy, cx + lo, cx + hi
+
+
+def circle_spans(cx, cy, r, filled=False):
+    return _quadrant_spans(cx, cy, _circle_quadrant(r), filled)
+
+
+def ellipse_spans(cx, cy, rx, ry, filled=False):
+    return _quadrant_spans(cx, cy, _ellipse_quadrant(rx, ry), filled)
+
+
 class RasterLabApp:
     def __init__(self, root):
         self.root = root
@@ -26,7 +353,9 @@ class RasterLabApp:
             ("Пошаговый", "step"),
             ("ЦДА", "dda"),
             ("Брезенхем (отрезок)", "bresenham_line"),
-            ("Брезенхем (окружность)", "bresenham_circle")
+            ("Брезенхем (окружность)", "bresenham_circle"),
+            ("Окружность (отрезками строк)", "circle_spans"),
+            ("Эллипс (отрезками строк)", "ellipse_spans")
         ]:
             ttk.Radiobutton(control, text=text, variable=self.algo, value=val).pack(anchor=tk.W, padx=5, pady=2)
 
@@ -40,17 +369,41 @@ class RasterLabApp:
         self.create_coord_entry(control, "Центр X:", "cx", 0)
         self.create_coord_entry(control, "Центр Y:", "cy", 0)
         self.create_coord_entry(control, "Радиус:", "r", 15)
+        self.create_coord_entry(control, "Полуось X:", "rx", 20)
+        self.create_coord_entry(control, "Полуось Y:", "ry", 10)
+        self.filled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control, text="Заливка", variable=self.filled).pack(anchor=tk.W, pady=(5, 0))
 
         ttk.Button(control, text="Выполнить", command=self.run).pack(pady=20)
 
         self.time_label = ttk.Label(control, text="Время: —", font=("Arial", 9))
         self.time_label.pack(anchor=tk.W)
 
+        view = ttk.Frame(control)
+        view.pack(anchor=tk.W, pady=(15, 0))
+        ttk.Button(view, text="+", width=3, command=lambda: self.zoom_by(1)).pack(side=tk.LEFT)
+        ttk.Button(view, text="−", width=3, command=lambda: self.zoom_by(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(view, text="Сброс вида", command=self.reset_view).pack(side=tk.LEFT)
+        self.view_label = ttk.Label(control, text="", font=("Arial", 9))
+        self.view_label.pack(anchor=tk.W, pady=(5, 0))
+
         canvas_frame = ttk.Frame(root)
         canvas_frame.pack(side=tk.RIGHT, padx=10, pady=10)
         self.canvas = tk.Canvas(canvas_frame, width=CANVAS_SIZE, height=CANVAS_SIZE, bg="white")
         self.canvas.pack()
-        self.draw_grid()
+        self.raster = TileRaster()
+        # Одна картинка на весь холст: при смене вида перерисовывается целиком,
+        # при изменении примитивов — только изменённые плитки (put -to)
+        self.photo = tk.PhotoImage(width=CANVAS_SIZE, height=CANVAS_SIZE)
+        self.photo_item = self.canvas.create_image(0, 0, anchor="nw", image=self.photo)
+        self.view_job = None
+        self.drag = None
+        self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom_by(1 if e.delta > 0 else -1, e.x, e.y))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_by(1, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_by(-1, e.x, e.y))
+        self.reset_view()
 
     def create_coord_entry(self, parent, label_text, var_name, default):
         frame = ttk.Frame(parent)
@@ -64,45 +417,150 @@ class RasterLabApp:
     def get_int(self, name):
         try:
             val = int(self.entries[name].get())
-            return val
         except ValueError:
             raise ValueError(f"Некорректное значение: {name}")
+        if abs(val) > COORD_LIMIT:
+            raise ValueError(f"{name}: допустимы значения от {-COORD_LIMIT} до {COORD_LIMIT}")
+        return val
+
+    # ========== Вид: масштаб и сдвиг ==========
+    def view_scale(self):
+        # (пикселей на клетку, клеток на пиксель) — одно из двух равно 1
+        scale = ZOOM_LEVELS[self.zoom]
+        if scale >= 1:
+            return int(scale), 1
+        return 1, int(round(1 / scale))
+
+    def view_cells(self):
+        # Клеток по стороне окна (с неполной крайней), кратно шагу
+        px, step = self.view_scale()
+        return -(-CANVAS_SIZE // px) * step
+
+    def snap_view(self):
+        # При уменьшении начало вида выравнивается на блок клеток одного пикселя
+        step = self.view_scale()[1]
+        self.row0 -= self.row0 % step
+        self.col0 -= self.col0 % step
+
+    def reset_view(self):
+        self.zoom = ZOOM_LEVELS.index(PIXEL_SCALE)
+        self.row0, self.col0 = -GRID_MAX, GRID_MIN
+        self.redraw_view()
+
+    def zoom_by(self, delta, x=CANVAS_SIZE // 2, y=CANVAS_SIZE // 2):
+        zoom = min(max(self.zoom + delta, 0), len(ZOOM_LEVELS) - 1)
+        if zoom == self.zoom:
+            return
+        # Клетка под курсором остаётся на месте
+        cell = ZOOM_LEVELS[self.zoom]
+        row, col = self.row0 + y / cell, self.col0 + x / cell
+        self.zoom = zoom
+        cell = ZOOM_LEVELS[zoom]
+        self.row0, self.col0 = math.floor(row - y / cell), math.floor(col - x / cell)
+        self.snap_view()
+        self.schedule_view()
+
+    def on_drag_start(self, event):
+        self.drag = (event.x, event.y, self.row0, self.col0)
+
+    def on_drag(self, event):
+        x, y, row0, col0 = self.drag
+        cell = ZOOM_LEVELS[self.zoom]
+        self.row0 = row0 + int(round((y - event.y) / cell))
+        self.col0 = col0 + int(round((x - event.x) / cell))
+        self.snap_view()
+        self.schedule_view()
+
+    def schedule_view(self):
+        # Серия событий мыши — одна перерисовка
+        if self.view_job is None:
+            self.view_job = self.root.after_idle(self.redraw_view)
+
+    def redraw_view(self):
+        self.view_job = None
+        self.raster.flush()
+        n = self.view_cells()
+        self.draw_cells(self.row0, self.col0, self.row0 + n, self.col0 + n)
+        self.draw_grid()
+        px, step = self.view_scale()
+        scale = f"{px} пикс/клетку" if step == 1 else f"{step} клеток/пикс"
+        self.view_label.config(text=f"Масштаб: {scale}, x {self.col0}..{self.col0 + n - 1}, "
+                                    f"y {-self.row0 - n + 1}..{-self.row0}")
+
+    def redraw_dirty(self):
+        # Только изменённые плитки, и только та их часть, что видна
+        dirty = self.raster.flush()
+        if not dirty:
+            return
+        rows = [tr for tr, _ in dirty]
+        cols = [tc for _, tc in dirty]
+        self.draw_cells(min(rows) * TILE, min(cols) * TILE, (max(rows) + 1) * TILE, (max(cols) + 1) * TILE)
+
+    def draw_cells(self, r_a, c_a, r_b, c_b):
+        # Клетки [r_a, r_b) x [c_a, c_b) в картинку холста
+        px, step = self.view_scale()
+        n = self.view_cells()
+        r_a = max(r_a - r_a % step, self.row0)
+        c_a = max(c_a - c_a % step, self.col0)
+        r_b = min(-(-r_b // step) * step, self.row0 + n)
+        c_b = min(-(-c_b // step) * step, self.col0 + n)
+        if r_a >= r_b or c_a >= c_b:
+            return
+        idx = self.raster.sample(r_a, c_a, (r_b - r_a) // step, (c_b - c_a) // step, step)
+        x, y = (c_a - self.col0) // step * px, (r_a - self.row0) // step * px
+        data = framebuffer_to_ppm(idx, px, CANVAS_SIZE - x, CANVAS_SIZE - y)
+        self.photo.tk.call(self.photo.name, "put", data, "-format", "PPM", "-to", x, y)
 
     def draw_grid(self):
-        self.canvas.delete("all")
-        center_px = (GRID_MAX) * PIXEL_SCALE
-
-        for i in range(GRID_SIZE):
-            x = i * PIXEL_SCALE
-            y = i * PIXEL_SCALE
-            self.canvas.create_line(x, 0, x, CANVAS_SIZE, fill="lightgray")
-            self.canvas.create_line(0, y, CANVAS_SIZE, y, fill="lightgray")
-
-        self.canvas.create_line(center_px, 0, center_px, CANVAS_SIZE, fill="black", width=2)
-        self.canvas.create_line(0, center_px, CANVAS_SIZE, center_px, fill="black", width=2)
-
-        self.canvas.create_text(center_px - 10, 10, text="Y", anchor="w", font=("Arial", 9, "bold"))
-        self.canvas.create_text(CANVAS_SIZE - 10, center_px + 10, text="X", anchor="e", font=("Arial", 9, "bold"))
-
-        for i in range(GRID_MIN, GRID_MAX + 1):
-            if i % 5 == 0 and i != 0:
-                # По X
-                x_px = (i - GRID_MIN) * PIXEL_SCALE
-                self.canvas.create_text(x_px, center_px + 15, text=str(i), font=("Arial", 7))
-                # По Y
-                y_px = (-i - GRID_MIN) * PIXEL_SCALE
-                self.canvas.create_text(center_px - 15, y_px, text=str(i), font=("Arial", 7))
+        # Только видимые линии; при мелком масштабе — через k клеток (1, 5, 10, 50, ...)
+        self.canvas.delete("grid")
+        px, step = self.view_scale()
+        cell = px / step
+        n = self.view_cells()
+        k = next(v for v in NICE_STEPS if v * cell >= GRID_MIN_PX)
+        label = next(v for v in NICE_STEPS if v >= k and v * cell >= LABEL_MIN_PX)
+
+        for i in range(-(-self.col0 // k) * k, self.col0 + n + 1, k):
+            x = (i - self.col0) * cell
+            self.canvas.create_line(x, 0, x, CANVAS_SIZE, fill="lightgray", tags="grid")
+        for i in range(-(-self.row0 // k) * k, self.row0 + n + 1, k):
+            y = (i - self.row0) * cell
+            self.canvas.create_line(0, y, CANVAS_SIZE, y, fill="lightgray", tags="grid")
+
+        # Оси; если ось за краем, подписи прижимаются к краю
+        axis_x, axis_y = self.grid_to_canvas(0, 0)
+        if 0 <= axis_x <= CANVAS_SIZE:
+            self.canvas.create_line(axis_x, 0, axis_x, CANVAS_SIZE, fill="black", width=2, tags="grid")
+        if 0 <= axis_y <= CANVAS_SIZE:
+            self.canvas.create_line(0, axis_y, CANVAS_SIZE, axis_y, fill="black", width=2, tags="grid")
+        axis_x = min(max(axis_x, 20), CANVAS_SIZE - 20)
+        axis_y = min(max(axis_y, 20), CANVAS_SIZE - 20)
+
+        self.canvas.create_text(axis_x - 10, 10, text="Y", anchor="w", font=("Arial", 9, "bold"), tags="grid")
+        self.canvas.create_text(CANVAS_SIZE - 10, axis_y + 10, text="X", anchor="e", font=("Arial", 9, "bold"),
+                                tags="grid")
+
+        for i in range(-(-self.col0 // label) * label, self.col0 + n + 1, label):
+            if i != 0:
+                self.canvas.create_text((i - self.col0) * cell, axis_y + 15, text=str(i), font=("Arial", 7), tags="grid")
+        for i in range(-(-self.row0 // label) * label, self.row0 + n + 1, label):
+            if i != 0:
+                self.canvas.create_text(axis_x - 15, (i - self.row0) * cell, text=str(-i), font=("Arial", 7),
+                                        tags="grid")
 
     def grid_to_canvas(self, gx, gy):
-        x = (gx - GRID_MIN) * PIXEL_SCALE
-        y = (-gy - GRID_MIN) * PIXEL_SCALE
+        px, step = self.view_scale()
+        x = (gx - self.col0) * px / step
+        y = (-gy - self.row0) * px / step
         return x, y
 
     def plot(self, gx, gy, color="red"):
-        if gx < GRID_MIN or gx > GRID_MAX or gy < GRID_MIN or gy > GRID_MAX:
-            return
-        x, y = self.grid_to_canvas(gx, gy)
-        self.canvas.create_rectangle(x, y, x + PIXEL_SCALE, y + PIXEL_SCALE, fill=color, outline="")
+        self.raster.set(-gy, gx, COLOR_INDEX[color])
+
+    def plot_span(self, gy, gx0, gx1, color="blue"):
+        # Отрезок строки [gx0, gx1] — по одному присваиванию среза на плитку
+        if gx0 <= gx1:
+            self.raster.set_span(-gy, gx0, gx1, COLOR_INDEX[color])
 
     def plot8circle(self, cx, cy, x, y, color="blue"):
         points = [
@@ -115,16 +573,17 @@ class RasterLabApp:
             self.plot(px, py, color)
 
     def run(self):
-        self.draw_grid()
+        self.raster.clear()
         algo = self.algo.get()
 
-        start_time = time.perf_counter()
         try:
             if algo in ("step", "dda", "bresenham_line"):
                 x1 = self.get_int("x1")
                 y1 = self.get_int("y1")
                 x2 = self.get_int("x2")
                 y2 = self.get_int("y2")
+                # Время — только алгоритм с записью в растр, без вывода на холст
+                start_time = time.perf_counter()
                 if algo == "step":
                     self.step_line(x1, y1, x2, y2)
                 elif algo == "dda":
@@ -137,14 +596,34 @@ class RasterLabApp:
                 r = self.get_int("r")
                 if r <= 0:
                     raise ValueError("Радиус должен быть положительным")
+                start_time = time.perf_counter()
                 self.bresenham_circle_full(cx, cy, r)
+            elif algo == "circle_spans":
+                cx = self.get_int("cx")
+                cy = self.get_int("cy")
+                r = self.get_int("r")
+                if r <= 0:
+                    raise ValueError("Радиус должен быть положительным")
+                start_time = time.perf_counter()
+                self.midpoint_circle(cx, cy, r, self.filled.get())
+            elif algo == "ellipse_spans":
+                cx = self.get_int("cx")
+                cy = self.get_int("cy")
+                rx = self.get_int("rx")
+                ry = self.get_int("ry")
+                if rx <= 0 or ry <= 0:
+                    raise ValueError("Полуоси должны быть положительными")
+                start_time = time.perf_counter()
+                self.midpoint_ellipse(cx, cy, rx, ry, self.filled.get())
             else:
                 raise ValueError("Неизвестный алгоритм")
         except Exception as e:
+            self.redraw_dirty()
             messagebox.showerror("Ошибка", str(e))
             return
 
         elapsed = time.perf_counter() - start_time
+        self.redraw_dirty()
         self.time_label.config(text=f"Время: {elapsed:.7f} с")
 
     def step_line(self, x1, y1, x2, y2):
@@ -210,6 +689,14 @@ class RasterLabApp:
                 e += 4 * x + 6
             self.plot8circle(cx, cy, x, y)
 
+    def midpoint_circle(self, cx, cy, r, filled=False):
+        for gy, x0, x1 in circle_spans(cx, cy, r, filled):
+            self.plot_span(gy, x0, x1)
+
+    def midpoint_ellipse(self, cx, cy, rx, ry, filled=False):
+        for gy, x0, x1 in ellipse_spans(cx, cy, rx, ry, filled):
+            self.plot_span(gy, x0, x1)
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = RasterLabApp(root)
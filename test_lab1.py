@@ -0,0 +1,108 @@
+import colorsys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from lab1 import (ColorConverterApp, cmyk_to_rgb, cmyk_to_rgb_batch, create_pnm, hls_to_rgb_batch, open_pnm,
+                  open_rgb_image, quantize_cmyk, read_pnm_header, rgb_index, rgb_to_cmyk, rgb_to_cmyk_batch,
+                  rgb_to_hls_batch, separate_cmyk_plates)
+
+rng = np.random.default_rng(0)
+EDGE_RGB = [(0, 0, 0), (255, 255, 255), (128, 128, 128), (1, 1, 1), (255, 0, 0), (0, 255, 0), (0, 0, 255),
+            (254, 255, 255), (255, 254, 0)]
+RGB = np.concatenate([rng.integers(0, 256, (2000, 3)), EDGE_RGB])
+EDGE_CMYK = [(0, 0, 0, 1), (0, 0, 0, 0), (1, 1, 1, 0), (0.5, 0.5, 0.5, 0.5), (0.2, 0.4, 0.6, 1)]
+CMYK = np.concatenate([rng.random((2000, 4)), EDGE_CMYK])
+# Отрицательный оттенок и оттенок > 360, S == 0, крайние L
+EDGE_HLS = [(-30, 0.5, 0.5), (-360, 0.3, 1), (720, 0.5, 0.5), (400, 0.7, 0.2), (123, 0.4, 0), (0, 0, 1), (0, 1, 1)]
+HLS = np.concatenate([np.column_stack([rng.random(2000) * 360, rng.random(2000), rng.random(2000)]), EDGE_HLS])
+
+
+def test_rgb_to_cmyk_batch_matches_scalar():
+    expected = np.array([rgb_to_cmyk(*map(int, c)) for c in RGB])
+    assert np.array_equal(rgb_to_cmyk_batch(RGB), expected)
+
+
+def test_cmyk_to_rgb_batch_matches_scalar():
+    expected = np.array([cmyk_to_rgb(*c) for c in CMYK])
+    assert np.array_equal(cmyk_to_rgb_batch(CMYK), expected)
+
+
+def test_rgb_to_hls_batch_matches_colorsys():
+    expected = []
+    for r, g, b in RGB:
+        h, l, s = colorsys.rgb_to_hls(r / 255, g / 255, b / 255)
+        expected.append((h * 360, l, s))
+    assert np.array_equal(rgb_to_hls_batch(RGB), np.array(expected))
+
+
+def test_hls_to_rgb_batch_matches_colorsys():
+    expected = [tuple(round(v * 255) for v in colorsys.hls_to_rgb((h % 360) / 360, l, s)) for h, l, s in HLS]
+    assert np.array_equal(hls_to_rgb_batch(HLS), np.array(expected))
+
+
+@pytest.mark.parametrize("rgb", EDGE_RGB)
+def test_black_and_gray_edge_cases(rgb):
+    cmyk = rgb_to_cmyk_batch([rgb])[0]
+    assert tuple(cmyk) == rgb_to_cmyk(*rgb)
+    if rgb[0] == rgb[1] == rgb[2]:
+        assert rgb_to_hls_batch([rgb])[0][2] == 0.0
+
+
+@pytest.mark.parametrize("rgb", [(0, 256, 0), (256, 0, 0), (-1, 0, 0)])
+def test_rgb_index_rejects_out_of_range(rgb):
+    with pytest.raises(ValueError):
+        rgb_index([rgb])
+
+
+@pytest.mark.parametrize("header", [b"P6 10 10", b"P6 10 10 255", b"P6 10 # comment", b""])
+def test_read_pnm_header_truncated(tmp_path, header):
+    path = tmp_path / "bad.ppm"
+    path.write_bytes(header)
+    with pytest.raises(ValueError):
+        read_pnm_header(str(path))
+
+
+def test_separate_cmyk_plates_accepts_grayscale(tmp_path):
+    gray = rng.integers(0, 256, (7, 5), dtype=np.uint8)
+    src = create_pnm(str(tmp_path / "gray.pgm"), 5, 7, 1)
+    src[:] = gray
+    src.flush()
+    # .pgm открывается без чтения целиком — двумерным memmap, полосы разворачиваются в RGB
+    opened = open_rgb_image(str(tmp_path / "gray.pgm"))
+    assert isinstance(opened, np.memmap) and opened.ndim == 2
+    plates = [open_pnm(p) for p in separate_cmyk_plates(str(tmp_path / "gray.pgm"), str(tmp_path / "out"), 10)]
+    rgb = np.repeat(gray.reshape(-1, 1), 3, axis=1)
+    expected = quantize_cmyk(rgb_to_cmyk_batch(rgb))
+    for i, plate in enumerate(plates):
+        assert np.array_equal(plate.ravel(), expected[:, i])
+
+
+def make_scheduler():
+    # Окно без Tk: только планировщик, after ничего не запускает
+    app = object.__new__(ColorConverterApp)
+    app.root = SimpleNamespace(after=lambda delay, func: "job", after_idle=lambda func: "job",
+                               after_cancel=lambda job: None)
+    app.updating = False
+    app.pending_update = app.update_job = None
+    app.last_flush = 0.0
+    app.dropped_events = 0
+    app.commit_rgb_entry = lambda: None
+    app.process_rgb = lambda: None
+    return app
+
+
+def test_slider_tick_is_not_counted_as_dropped():
+    app = make_scheduler()
+    # Один шаг ползунка: trace переменной, затем command
+    app.on_rgb_entry(0)
+    app.on_rgb_slider(0)
+    assert app.dropped_events == 0 and app.pending_update is app.process_rgb
+    # Второй шаг в том же кадре вытесняет первый — это одно отброшенное событие
+    app.on_rgb_entry(0)
+    app.on_rgb_slider(0)
+    assert app.dropped_events == 1
+    app.flush_updates()
+    app.on_rgb_entry(1)
+    assert app.dropped_events == 1
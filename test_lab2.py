@@ -0,0 +1,113 @@
+import json
+
+import numpy as np
+import pytest
+
+import lab2
+from bench_lab2 import BASELINE, KERNELS, suite_inputs
+from lab2 import (GLOBAL_OPS, Pipeline, apply_operation, build_pyramid, equalize_rgb, image_digest, image_stats,
+                  linear_contrast, median_filter_rgb, prefix_stats, preview_params, rgb_to_hsv, source_stats)
+
+rng = np.random.default_rng(0)
+
+
+def test_stats_not_stale_after_in_place_edit():
+    img = rng.integers(50, 100, (32, 32, 3), dtype=np.uint8)
+    assert image_stats(img).max.max() < 100
+    img[0, 0] = 255
+    assert image_stats(img).max.max() == 255
+    expected = linear_contrast(img.copy())
+    assert np.array_equal(linear_contrast(img), expected)
+    img[:] = 0
+    assert np.array_equal(equalize_rgb(img), equalize_rgb(img.copy()))
+
+
+def test_read_only_stats_are_cached():
+    img = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    img.flags.writeable = False
+    assert image_stats(img) is image_stats(img)
+
+
+def test_pyramid_levels_read_only():
+    img = rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    levels = build_pyramid(img, size=(16, 16))
+    assert len(levels) > 1
+    assert not any(level.flags.writeable for level in levels[1:])
+
+
+@pytest.mark.parametrize("steps", [
+    [("gamma", {"gamma": 0.5}), ("contrast", {})],
+    [("median", {"k": 3}), ("equalize_rgb", {})],
+    [("contrast", {}), ("gamma", {"gamma": 2.0}), ("equalize_hsv", {})],
+    [("equalize_hsv", {}), ("contrast", {})],
+])
+def test_chained_steps_match_full_resolution_export(tmp_path, steps):
+    # Цепочка с шагами по статистике полного изображения совпадает с потоковым экспортом
+    src = (rng.random((60, 80, 3)) ** 2 * 200 + 20).astype(np.uint8)
+    full = source_stats(src)
+    img = src
+    for i, (op, params) in enumerate(steps):
+        stats = prefix_stats(src, steps[:i], full, str(tmp_path), op == "equalize_hsv") if op in GLOBAL_OPS else None
+        img = apply_operation(img, op, None, **preview_params(op, params, 1.0, stats))
+    pipeline = Pipeline(src)
+    for op, params in steps:
+        pipeline = pipeline.then(op, **params)
+    expected = pipeline.stream(src, str(tmp_path / "export.npy"), str(tmp_path))
+    assert np.array_equal(img, np.asarray(expected))
+
+
+def test_stream_export_onto_own_source(tmp_path):
+    # Сохранение поверх загруженного .npy не должно обрезать его до чтения
+    img = (rng.random((40, 50, 3)) * 150 + 40).astype(np.uint8)
+    path = str(tmp_path / "src.npy")
+    np.save(path, img)
+    src = np.load(path, mmap_mode="r")
+    result = Pipeline(src).then("contrast").then("median", k=3).stream(src, path, str(tmp_path))
+    reference = Pipeline(img).then("contrast").then("median", k=3).evaluate()
+    assert np.array_equal(np.asarray(result), reference)
+    assert np.array_equal(np.load(path), reference)
+    assert np.array_equal(src, img)  # открытое отображение осталось прежним
+    result = Pipeline(path).then("contrast").stream(path, path, str(tmp_path))
+    assert np.array_equal(np.asarray(result), linear_contrast(reference))
+
+
+def median_reference(img, k):
+    # Исходный поканальный цикл: медиана окна k×k через np.partition, края 'edge'
+    if k % 2 == 0:
+        k += 1
+    pad, mid = k // 2, (k * k) // 2
+    widths = ((pad, pad), (pad, pad), (0, 0)) if img.ndim == 3 else pad
+    padded = np.pad(img, widths, mode="edge")
+    out = np.zeros_like(img)
+    for i in range(img.shape[0]):
+        for j in range(img.shape[1]):
+            window = padded[i:i + k, j:j + k].reshape(k * k, -1)
+            out[i, j] = np.partition(window, mid, axis=0)[mid].reshape(out[i, j].shape)
+    return out
+
+
+@pytest.mark.parametrize("shape", [(23, 31, 3), (19, 17), (3, 2, 3), (1, 1)])
+@pytest.mark.parametrize("k", [1, 3, 4, 5, 17])
+@pytest.mark.parametrize("method", ["window", "hist"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_median_filter_matches_reference(monkeypatch, shape, k, method, workers):
+    # Плитки по 8 пикселей: при workers=2 проверяются швы плиток и запас по краям
+    monkeypatch.setattr(lab2, "MEDIAN_TILE", 8)
+    img = rng.integers(0, 256, shape, dtype=np.uint8)
+    img[rng.random(shape) < 0.2] = 255
+    expected = median_reference(img, k)
+    assert np.array_equal(median_filter_rgb(img, k, method=method, workers=workers), expected)
+
+
+with open(BASELINE) as f:
+    BASELINE_HASHES = json.load(f)
+FIXTURES = list(suite_inputs(["256"]))
+
+
+@pytest.mark.parametrize("kernel", list(KERNELS))
+@pytest.mark.parametrize("name, img", FIXTURES, ids=[name for name, _ in FIXTURES])
+def test_outputs_match_bench_baseline(kernel, name, img):
+    # Хэши выходов из bench_lab2_baseline.json — для дешёвых случаев (256² и картинки из репозитория)
+    expected = BASELINE_HASHES[f"{kernel}/{name}"]
+    assert list(img.shape) == expected["shape"]
+    assert image_digest(KERNELS[kernel](img, rgb_to_hsv(img))) == expected["hash"]
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from lab2_batch import collect
+
+
+def write_inputs(directory, names):
+    directory.mkdir()
+    for name in names:
+        Image.fromarray(np.zeros((4, 4, 3), dtype=np.uint8)).save(directory / name)
+
+
+def test_collect_rejects_outputs_clashing_by_extension(tmp_path):
+    write_inputs(tmp_path / "in", ["a.jpg", "a.png", "b.png"])
+    with pytest.raises(ValueError, match="a.jpg, a.png"):
+        collect(str(tmp_path / "in"), str(tmp_path / "out"), [("gamma", {"gamma": 2.0})], fmt="png")
+    # Без --format имена выходов совпадают с входами и не пересекаются
+    jobs, skipped, _, _ = collect(str(tmp_path / "in"), str(tmp_path / "out"), [("gamma", {"gamma": 2.0})])
+    assert len(jobs) == 3 and skipped == 0
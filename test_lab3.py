@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from lab3 import (TILE, RasterLabApp, TileRaster, bresenham_circles, bresenham_lines, circle_spans, dda_lines,
+                  ellipse_spans)
+
+rng = np.random.default_rng(0)
+SEGMENTS = np.concatenate([
+    rng.integers(-50, 50, (500, 4)),
+    rng.integers(-3000, 3000, (20, 4)),
+    # Точка, вертикаль, горизонталь назад, пологая и крутая в обратную сторону
+    [[0, 0, 0, 0], [5, 5, 5, 9], [3, 1, -7, 1], [0, 0, 7, 3], [0, 0, -3, -7]],
+])
+CIRCLES = np.concatenate([
+    np.column_stack([rng.integers(-50, 50, (300, 2)), rng.integers(0, 80, 300)]),
+    [[0, 0, 0], [1, 2, 1], [0, 0, 2000]],
+])
+
+
+def record(method, *args):
+    # Методы окна с подставным self: plot записывает точки по порядку, с повторами
+    points = []
+    app = SimpleNamespace(plot=lambda x, y, color="red": points.append((x, y)))
+    app.plot8circle = lambda *a, **k: RasterLabApp.plot8circle(app, *a, **k)
+    getattr(RasterLabApp, method)(app, *args)
+    return points
+
+
+@pytest.mark.parametrize("method, batch, prims", [
+    ("step_line", dda_lines, SEGMENTS),
+    ("dda_line", dda_lines, SEGMENTS),
+    ("bresenham_line_full", bresenham_lines, SEGMENTS),
+    ("bresenham_circle_full", bresenham_circles, CIRCLES),
+])
+def test_batch_matches_app_methods(method, batch, prims):
+    xs, ys, offsets = batch(prims)
+    assert len(offsets) == len(prims) + 1
+    for i, row in enumerate(prims):
+        got = list(zip(xs[offsets[i]:offsets[i + 1]].tolist(), ys[offsets[i]:offsets[i + 1]].tolist()))
+        assert got == record(method, *map(int, row)), row
+
+
+def test_dda_lines_chunking():
+    xs, ys, offsets = dda_lines(SEGMENTS)
+    xs2, ys2, offsets2 = dda_lines(SEGMENTS, max_cells=1000)
+    assert np.array_equal(xs, xs2) and np.array_equal(ys, ys2) and np.array_equal(offsets, offsets2)
+
+
+@pytest.mark.parametrize("batch, width", [(dda_lines, 4), (bresenham_lines, 4), (bresenham_circles, 3)])
+def test_batch_empty(batch, width):
+    xs, ys, offsets = batch(np.zeros((0, width), dtype=np.int64))
+    assert len(xs) == len(ys) == 0 and list(offsets) == [0]
+
+
+@pytest.mark.parametrize("rx, ry", [(10, 1), (100, 2), (1, 10), (2, 100), (0, 5), (5, 0), (0, 0), (7, 7), (300, 3)])
+def test_ellipse_axis_extents(rx, ry):
+    extents = {}
+    for y, x0, x1 in ellipse_spans(0, 0, rx, ry, filled=True):
+        lo, hi = extents.get(y, (x0, x1))
+        extents[y] = (min(lo, x0), max(hi, x1))
+    assert extents[0] == (-rx, rx)
+    assert max(extents) == ry and min(extents) == -ry
+
+
+def dense_sample(cells, origin, row0, col0, rows, cols, step):
+    # Эталон: плотный массив клеток, блоки step x step сводятся по максимуму
+    out = np.zeros((rows * step, cols * step), dtype=np.uint8)
+    r_a, c_a = max(row0, origin), max(col0, origin)
+    r_b = min(row0 + rows * step, origin + cells.shape[0])
+    c_b = min(col0 + cols * step, origin + cells.shape[1])
+    if r_a < r_b and c_a < c_b:
+        out[r_a - row0:r_b - row0, c_a - col0:c_b - col0] = cells[r_a - origin:r_b - origin, c_a - origin:c_b - origin]
+    return out.reshape(rows, step, cols, step).max(axis=(1, 3))
+
+
+def test_tile_raster_spans_match_dense():
+    raster, origin = TileRaster(), -1024
+    cells = np.zeros((2048, 2048), dtype=np.uint8)
+    for row, col in rng.integers(-1000, 1000, (500, 2)):
+        raster.set(row, col, 1)
+        cells[row - origin, col - origin] = 1
+    for gy, x0, x1 in circle_spans(3, -5, 900, filled=True):
+        raster.set_span(-gy, x0, x1, 2)
+        cells[-gy - origin, x0 - origin:x1 - origin + 1] = 2
+    for step in (1, 4, 64, 256, 512):
+        for row0, col0 in ((-1024, -1024), (-512, 256), (0, -2048)):
+            row0, col0 = row0 // step * step, col0 // step * step
+            rows = cols = max(1, 1536 // step)
+            expected = dense_sample(cells, origin, row0, col0, rows, cols, step)
+            assert np.array_equal(raster.sample(row0, col0, rows, cols, step), expected), (step, row0, col0)
+
+
+def test_tile_raster_fill_tiles_grow_linearly():
+    # Внутренность круга — записи отрезков, плотные плитки только по краю: O(r), а не O(r^2)
+    raster, r = TileRaster(), 10000
+    for gy, x0, x1 in circle_spans(0, 0, r, filled=True):
+        raster.set_span(-gy, x0, x1, 2)
+    assert len(raster.tiles) < 8 * (2 * r // TILE + 1)
+    assert len(raster.runs) <= 2 * r + 1
+
+
+def test_tile_raster_dirty_bounds_runs():
+    raster = TileRaster()
+    raster.set_span(10, -5000, 5000, 2)
+    dirty = raster.flush()
+    assert min(tc for _, tc in dirty) == -5000 // TILE and max(tc for _, tc in dirty) == 5000 // TILE
+    raster.clear()
+    assert raster.flush() == dirty and not raster.runs